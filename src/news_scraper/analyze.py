@@ -1,17 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 from pathlib import Path
-from typing import Iterator, Optional, Set
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-from news_scraper.io import append_jsonl, iter_jsonl, load_seen_urls, normalize_url
-from news_scraper.llm_client import LLMClient
-from news_scraper.models import ArticleAI, ArticleRaw
-from news_scraper.prompts import build_article_analysis_prompt
+from news_scraper.config import settings
+from news_scraper.io import JsonlAppender, iter_jsonl, load_seen_urls, normalize_url
+from news_scraper.llm_client import LLMClient, get_llm_client
+from news_scraper.models import ArticleAI, ArticleRaw, LLMArticleAnalysis
+from news_scraper.prompts import (
+    build_article_analysis_prompt,
+    build_batch_analysis_prompt,
+    estimate_tokens,
+)
+from news_scraper.ratelimit import AdaptiveLimiter
 
 log = logging.getLogger("news_scraper.analyze")
 
 
+def _build_enriched(raw: ArticleRaw, client: LLMClient, analysis: LLMArticleAnalysis) -> ArticleAI:
+    # raw and analysis are already validated: copy fields without a dump + re-validate round-trip
+    return ArticleAI.model_construct(
+        **dict(raw),
+        summary=analysis.summary,
+        topics=analysis.topics,
+        llm_model=client._model,  # prototype audit field
+    )
+
+
 def analyze_one_article_raw(client: LLMClient, raw: ArticleRaw) -> ArticleAI:
     """
     Analyze one ArticleRaw with the LLM and return ArticleAI.
@@ -19,23 +37,45 @@ def analyze_one_article_raw(client: LLMClient, raw: ArticleRaw) -> ArticleAI:
     """
     prompt = build_article_analysis_prompt(raw)
     analysis = client.analyze_article(prompt)
+    return _build_enriched(raw, client, analysis)
+
+
+async def analyze_one_article_raw_async(
+        client: LLMClient, raw: ArticleRaw, limiter: Optional[AdaptiveLimiter] = None
+) -> ArticleAI:
+    """
+    Async variant of analyze_one_article_raw.
+    Raises on failure (caller decides how to persist failures).
+    """
+    prompt = build_article_analysis_prompt(raw)
+    analysis = await client.analyze_article_async(prompt, limiter)
+    return _build_enriched(raw, client, analysis)
+
 
-    enriched = ArticleAI(**raw.model_dump(mode="json"))
-    enriched.summary = analysis.summary
-    enriched.topics = analysis.topics
-    enriched.llm_model = client._model  # prototype audit field
-    return enriched
+async def analyze_article_batch_async(
+        client: LLMClient, batch: List[ArticleRaw], limiter: Optional[AdaptiveLimiter] = None
+) -> List[ArticleAI]:
+    """
+    Analyze several ArticleRaw records with one LLM request.
+    Returns ArticleAI records in input order. Raises on failure.
+    """
+    prompt = build_batch_analysis_prompt(batch)
+    analyses = await client.analyze_articles_batch_async(prompt, len(batch), limiter)
+    return [_build_enriched(raw, client, analysis) for raw, analysis in zip(batch, analyses)]
 
 
 def build_failed_ai_from_raw(raw: ArticleRaw, client: LLMClient, exc: Exception) -> ArticleAI:
     """
     Create a failed ArticleAI record for audit trail.
     """
-    enriched = ArticleAI(**raw.model_dump(mode="json"))
-    enriched.status = "failed"
-    enriched.error = f"llm error: {type(exc).__name__}: {exc}"
-    enriched.llm_model = getattr(client, "_model", None)
-    return enriched
+    return ArticleAI.model_construct(
+        **{
+            **dict(raw),
+            "status": "failed",
+            "error": f"llm error: {type(exc).__name__}: {exc}",
+            "llm_model": getattr(client, "_model", None),
+        }
+    )
 
 
 def iter_ok_articles(raw_jsonl: Path) -> Iterator[ArticleRaw]:
@@ -43,64 +83,302 @@ def iter_ok_articles(raw_jsonl: Path) -> Iterator[ArticleRaw]:
     Yield ArticleRaw eligible for LLM analysis:
     - status == 'ok'
     - non-empty text
+
+    Filters on the raw dicts so only eligible rows pay for model validation.
     """
     for obj in iter_jsonl(raw_jsonl):
-        art = ArticleRaw.model_validate(obj)
-
-        if art.status != "ok":
+        if obj.get("status", "ok") != "ok":
+            continue
+        text = obj.get("text")
+        if not text or not text.strip():
             continue
-        if not art.text or not art.text.strip():
+
+        yield ArticleRaw.model_validate(obj)
+
+
+def _iter_chunks(articles: Iterable[ArticleRaw], batch_size: int, max_tokens: int) -> Iterator[List[ArticleRaw]]:
+    """
+    Group articles into chunks of at most batch_size, starting a new chunk early
+    when the estimated prompt tokens would exceed max_tokens.
+    An article that alone exceeds the budget still gets its own chunk.
+    """
+    current: List[ArticleRaw] = []
+    current_tokens = 0
+
+    for article in articles:
+        tokens = estimate_tokens(article.title or "") + estimate_tokens(article.text or "")
+        if current and (len(current) >= batch_size or current_tokens + tokens > max_tokens):
+            yield current
+            current = []
+            current_tokens = 0
+        current.append(article)
+        current_tokens += tokens
+
+    if current:
+        yield current
+
+
+Outcome = Tuple[ArticleRaw, Optional[ArticleAI], Optional[Exception]]
+
+
+async def _analyze_chunk(
+        client: LLMClient, chunk: List[ArticleRaw], limiter: Optional[AdaptiveLimiter] = None
+) -> List[Outcome]:
+    """
+    Analyze one chunk. Multi-article chunks fall back to per-article requests
+    if the batched response cannot be used (e.g. wrong item count).
+    """
+    if len(chunk) > 1:
+        try:
+            results = await analyze_article_batch_async(client, chunk, limiter)
+            return [(raw, enriched, None) for raw, enriched in zip(chunk, results)]
+        except Exception as e:
+            log.warning("Batch of %d articles failed (%s), retrying one by one", len(chunk), e)
+
+    outcomes: List[Outcome] = []
+    for raw in chunk:
+        try:
+            outcomes.append((raw, await analyze_one_article_raw_async(client, raw, limiter), None))
+        except Exception as e:
+            outcomes.append((raw, None, e))
+    return outcomes
+
+
+async def _produce_chunks(
+        chunks: Iterator[List[ArticleRaw]],
+        chunk_queue: "asyncio.Queue[Optional[List[ArticleRaw]]]",
+        workers: int,
+) -> None:
+    """
+    Stage 1: read + validate raw JSONL and queue chunks for the LLM workers.
+    End-of-input markers are only sent on success: if any stage fails, the
+    pipeline is cancelled instead (awaiting a put on a queue nobody drains
+    any more would hang the shutdown).
+    """
+    for chunk in chunks:
+        await chunk_queue.put(chunk)
+    for _ in range(workers):
+        await chunk_queue.put(None)
+
+
+async def _analyze_worker(
+        client: LLMClient,
+        limiter: AdaptiveLimiter,
+        chunk_queue: "asyncio.Queue[Optional[List[ArticleRaw]]]",
+        result_queue: "asyncio.Queue[Optional[List[Outcome]]]",
+) -> None:
+    """
+    Stage 2: analyze queued chunks with the async LLM client.
+    """
+    while (chunk := await chunk_queue.get()) is not None:
+        await result_queue.put(await _analyze_chunk(client, chunk, limiter))
+
+
+async def _write_outcomes(
+        client: LLMClient,
+        result_queue: "asyncio.Queue[Optional[List[Outcome]]]",
+        writer: JsonlAppender,
+        counts: Dict[str, int],
+) -> None:
+    """
+    Stage 3: append results (or failure records) as they complete,
+    so the file grows incrementally.
+    """
+    while (outcomes := await result_queue.get()) is not None:
+        for raw, enriched, exc in outcomes:
+            if exc is None:
+                writer.write(enriched.model_dump(mode="json"))
+                counts["processed"] += 1
+            else:
+                failed_rec = build_failed_ai_from_raw(raw, client, exc)
+                writer.write(failed_rec.model_dump(mode="json"))
+                counts["failed"] += 1
+
+        log.info(
+            "Analyzed %d articles (%d failed); last: %s",
+            counts["processed"] + counts["failed"],
+            counts["failed"],
+            outcomes[-1][0].url,
+        )
+
+
+async def _analyze_pipeline(
+        client: LLMClient,
+        chunks: Iterator[List[ArticleRaw]],
+        writer: JsonlAppender,
+        concurrency: int,
+        counts: Dict[str, int],
+) -> None:
+    """
+    Run reader -> LLM workers -> writer as one pipeline, with at most `concurrency`
+    requests in flight; the limit adapts to the account's rate-limit headers and
+    backs off on 429s.
+    """
+    chunk_queue: asyncio.Queue[Optional[List[ArticleRaw]]] = asyncio.Queue(maxsize=2 * concurrency)
+    result_queue: asyncio.Queue[Optional[List[Outcome]]] = asyncio.Queue(maxsize=2 * concurrency)
+    limiter = AdaptiveLimiter(concurrency)
+
+    async def _analyze_stage() -> None:
+        await asyncio.gather(
+            *(_analyze_worker(client, limiter, chunk_queue, result_queue) for _ in range(concurrency))
+        )
+        await result_queue.put(None)
+
+    await asyncio.gather(
+        _produce_chunks(chunks, chunk_queue, concurrency),
+        _analyze_stage(),
+        _write_outcomes(client, result_queue, writer, counts),
+    )
+
+
+def _iter_pending(
+        raw_file: Path, already: Set[str], limit: Optional[int], counts: Dict[str, int]
+) -> Iterator[ArticleRaw]:
+    """
+    Yield eligible articles whose normalized URL is not in `already`
+    (updated as it goes), counting the rest in counts["skipped_already"].
+    """
+    yielded = 0
+
+    for article in iter_ok_articles(raw_file):
+        if limit is not None and yielded >= limit:
+            break
+
+        url_key = normalize_url(str(article.url))
+        if url_key in already:
+            counts["skipped_already"] += 1
             continue
 
-        yield art
+        already.add(url_key)
+        yielded += 1
+        yield article
 
 
 def analyze_raw_to_ai_jsonl(
         raw_file: Path,
         out_file: Path,
         limit: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
 ) -> dict:
     """
     Batch analyze raw JSONL into AI JSONL.
+    Up to `concurrency` LLM requests run at once (default: settings.llm_concurrency),
+    each covering up to `batch_size` articles (default: settings.llm_batch_size).
+    Reading, LLM calls and writing run as an asyncio pipeline, so file IO
+    overlaps network latency. `limit` caps the articles sent to the LLM
+    (successes and failures alike), since they are queued before results are known.
 
     Strict no-duplicates policy:
     - If normalized URL already exists in out_file, it is skipped.
     """
-    client = LLMClient()
-    already: Set[str] = load_seen_urls(out_file)
+    client = get_llm_client()
+    concurrency = concurrency or settings.llm_concurrency
+    batch_size = batch_size or settings.llm_batch_size
 
-    processed = 0
-    skipped_already = 0
-    failed = 0
+    counts = {
+        "processed": 0,
+        "failed": 0,
+        "skipped_already": 0,
+    }
 
-    for idx, article in enumerate(iter_ok_articles(raw_file), start=1):
-        if limit is not None and processed >= limit:
-            break
+    # Load seen URLs before the writer opens out_file
+    pending = _iter_pending(raw_file, load_seen_urls(out_file), limit, counts)
+    chunks = _iter_chunks(pending, batch_size, settings.llm_batch_max_tokens)
+    with JsonlAppender(out_file) as writer:
+        asyncio.run(_analyze_pipeline(client, chunks, writer, concurrency, counts))
 
-        url_key = normalize_url(str(article.url))
-        if url_key in already:
-            skipped_already += 1
-            continue
+    summary = {
+        **counts,
+        "out_file": str(out_file),
+    }
+    log.info("Analyze finished: %s", summary)
+    return summary
 
-        log.info("Analyzing (%d) %s", idx, str(article.url))
 
-        try:
-            enriched = analyze_one_article_raw(client, article)
-            append_jsonl(out_file, enriched.model_dump(mode="json"))
-            processed += 1
-            already.add(url_key)
+def _batch_custom_id(article: ArticleRaw) -> str:
+    return hashlib.sha1(normalize_url(str(article.url)).encode("utf-8")).hexdigest()
 
-        except Exception as e:
-            failed_rec = build_failed_ai_from_raw(article, client, e)
-            append_jsonl(out_file, failed_rec.model_dump(mode="json"))
-            failed += 1
-            already.add(url_key)
 
+def analyze_raw_to_ai_jsonl_batch(
+        raw_file: Path,
+        out_file: Path,
+        limit: Optional[int] = None,
+        poll_interval_s: float = 30.0,
+        batch_ids: Optional[List[str]] = None,
+) -> dict:
+    """
+    Analyze raw JSONL into AI JSONL through the OpenAI Batch API.
+    Submits pending articles as one or more jobs (split to the Batch API
+    size limits), waits for each to finish (can take up to 24h) and appends
+    its results like analyze_raw_to_ai_jsonl as soon as it is done.
+
+    Resume: pass the `batch_ids` of already-submitted jobs (logged at submit
+    time) to collect their results without submitting again. Pending articles
+    not found in those jobs are left pending.
+
+    Strict no-duplicates policy:
+    - If normalized URL already exists in out_file, it is skipped.
+    """
+    client = get_llm_client()
     summary = {
-        "processed": processed,
-        "failed": failed,
-        "skipped_already": skipped_already,
+        "processed": 0,
+        "failed": 0,
+        "skipped_already": 0,
         "out_file": str(out_file),
     }
+    pending = list(_iter_pending(raw_file, load_seen_urls(out_file), limit, summary))
+
+    if not pending:
+        log.info("Analyze finished: %s", summary)
+        return summary
+
+    by_id = {_batch_custom_id(a): a for a in pending}
+    resuming = bool(batch_ids)
+    if not resuming:
+        batch_ids = client.submit_batches({cid: build_article_analysis_prompt(a) for cid, a in by_id.items()})
+        log.info("Submitted %d batch job(s); to resume after an interruption run: analyze --batch-id %s",
+                 len(batch_ids), " --batch-id ".join(batch_ids))
+
+    status = ""
+    for batch_id in batch_ids:
+        batch = client.wait_for_batch(batch_id, poll_interval_s=poll_interval_s)
+        status = batch.status
+
+        if batch.status == "failed" and not batch.output_file_id:
+            raise RuntimeError(f"Batch {batch_id} failed: {batch.errors}")
+
+        results = client.fetch_batch_results(batch)
+
+        # Written per job, so an interrupted run keeps the jobs already collected
+        with JsonlAppender(out_file) as writer:
+            for cid, result in results.items():
+                article = by_id.pop(cid, None)
+                if article is None:
+                    continue  # already written (or not pending any more)
+                _write_batch_result(writer, client, article, result, summary)
+
+    if by_id:
+        if resuming:
+            log.info("%d pending articles are not in the given batch jobs; left pending", len(by_id))
+            summary["not_in_batches"] = len(by_id)
+        else:
+            with JsonlAppender(out_file) as writer:
+                for article in by_id.values():
+                    missing = RuntimeError(f"missing from batch output (batch status: {status})")
+                    _write_batch_result(writer, client, article, missing, summary)
+
+    summary["batch_ids"] = batch_ids
     log.info("Analyze finished: %s", summary)
     return summary
+
+
+def _write_batch_result(writer: JsonlAppender, client: LLMClient, article: ArticleRaw, result: Any, summary: dict) -> None:
+    if isinstance(result, Exception):
+        failed_rec = build_failed_ai_from_raw(article, client, result)
+        writer.write(failed_rec.model_dump(mode="json"))
+        summary["failed"] += 1
+    else:
+        enriched = _build_enriched(article, client, result)
+        writer.write(enriched.model_dump(mode="json"))
+        summary["processed"] += 1
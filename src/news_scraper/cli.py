@@ -4,13 +4,14 @@ import logging
 import typer
 
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from news_scraper.config import settings
 from news_scraper.logging_utils import setup_logging
 from news_scraper.scrape import scrape_urls_to_jsonl
-from news_scraper.analyze import analyze_raw_to_ai_jsonl
+from news_scraper.analyze import analyze_raw_to_ai_jsonl, analyze_raw_to_ai_jsonl_batch
 from news_scraper.index import index_ai_jsonl_to_chroma
+from news_scraper.quantize import get_int8_index
 from news_scraper.search import semantic_search
 from news_scraper.ingest import ingest_url
 
@@ -49,13 +50,27 @@ def scrape(
             help="Output JSONL file (default: data/raw/articles_raw.jsonl)",
         ),
         limit: Optional[int] = typer.Option(None, help="Limit number of URLs"),
-        sleep_s: float = typer.Option(0.0, help="Sleep seconds between requests"),
+        sleep_s: float = typer.Option(
+            0.0,
+            help="Sleep seconds between requests (per concurrent request; implies --concurrency 1 unless set)",
+        ),
         min_chars: int = typer.Option(500, help="Minimum extracted text length"),
+        concurrency: Optional[int] = typer.Option(
+            None,
+            min=1,
+            help="Max URLs fetched concurrently (default: 32, or 1 with --sleep-s)",
+        ),
+        workers: Optional[int] = typer.Option(
+            None,
+            min=1,
+            help="Processes used for article extraction (default: CPU count)",
+        ),
 ) -> None:
     """
     Scrape news articles and write raw content to JSONL.
     """
     setup_logging(settings.log_level)
+    settings.ensure_dirs()
 
     if out_file is None:
         out_file = settings.data_raw_dir / "articles_raw.jsonl"
@@ -66,6 +81,8 @@ def scrape(
         limit=limit,
         sleep_s=sleep_s,
         min_chars=min_chars,
+        concurrency=concurrency,
+        workers=workers,
     )
 
     typer.echo(summary)
@@ -84,18 +101,58 @@ def analyze(
         help="Output AI JSONL file (default: data/processed/articles_ai.jsonl)",
     ),
     limit: Optional[int] = typer.Option(None, help="Limit number of eligible articles to analyze"),
+    concurrency: Optional[int] = typer.Option(
+        None,
+        "--concurrency",
+        min=1,
+        help="Max concurrent LLM requests (default: LLM_CONCURRENCY or 16)",
+    ),
+    batch_size: Optional[int] = typer.Option(
+        None,
+        "--batch-size",
+        min=1,
+        help="Articles packed into one LLM request (default: LLM_BATCH_SIZE or 1)",
+    ),
+    batch: bool = typer.Option(
+        False,
+        "--batch",
+        help="Use the OpenAI Batch API (cheaper, but may take up to 24h to complete)",
+    ),
+    batch_ids: Optional[List[str]] = typer.Option(
+        None,
+        "--batch-id",
+        help="Resume: collect results of already-submitted batch job(s) instead of submitting "
+             "(repeatable, implies --batch)",
+    ),
 ) -> None:
     """
     Generate LLM summaries and topics for scraped articles.
     """
     setup_logging(settings.log_level)
+    settings.ensure_dirs()
 
     if raw_file is None:
         raw_file = settings.data_raw_dir / "articles_raw.jsonl"
     if out_file is None:
         out_file = settings.data_processed_dir / "articles_ai.jsonl"
 
-    summary = analyze_raw_to_ai_jsonl(raw_file=raw_file, out_file=out_file, limit=limit)
+    if batch or batch_ids:
+        summary = analyze_raw_to_ai_jsonl_batch(
+            raw_file=raw_file,
+            out_file=out_file,
+            limit=limit,
+            batch_ids=batch_ids,
+        )
+        typer.echo(summary)
+        return
+
+    summary = analyze_raw_to_ai_jsonl(
+        raw_file=raw_file,
+        out_file=out_file,
+        limit=limit,
+        concurrency=concurrency,
+        batch_size=batch_size,
+    )
     typer.echo(summary)
 
 
@@ -112,6 +169,7 @@ def index(
     Index AI-enriched articles into Chroma vector database.
     """
     setup_logging(settings.log_level)
+    settings.ensure_dirs()
 
     if ai_file is None:
         ai_file = settings.data_processed_dir / "articles_ai.jsonl"
@@ -120,6 +178,17 @@ def index(
     typer.echo(summary)
 
 
+@app.command("build-int8-index")
+def build_int8_index() -> None:
+    """
+    Rebuild the int8 shadow index (SEARCH_INT8) from all vectors in Chroma.
+    """
+    setup_logging(settings.log_level)
+
+    count = get_int8_index().rebuild()
+    typer.echo({"vectors": count, "collection_dir": str(settings.chroma_dir)})
+
+
 @app.command()
 def search(
     query: str = typer.Argument(..., help="Search query (natural language)"),
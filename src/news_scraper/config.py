@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import os
 from pathlib import Path
 from typing import Literal, Optional
@@ -23,13 +24,39 @@ class Settings(BaseModel):
     openai_model: str = Field(default="gpt-4o-mini")
     openai_embedding_model: str = Field(default="text-embedding-3-small")
 
+    # Max number of in-flight LLM requests during batch analysis
+    llm_concurrency: int = Field(default=16, ge=1)
+    # Articles packed into one LLM request (1 = one request per article)
+    llm_batch_size: int = Field(default=1, ge=1)
+    # Estimated input-token budget for one multi-article request
+    llm_batch_max_tokens: int = Field(default=12000, ge=1)
+
     chroma_dir: Path = Field(default_factory=lambda: _project_root() / "data" / "vectorstore")
+    # Optional Chroma server for async queries, serving the same data as chroma_dir
+    # (chroma run --path <chroma_dir>); unset = local persistent store only
+    chroma_host: Optional[str] = None
+    chroma_port: int = Field(default=8000, ge=1)
+    # Number of Chroma collections documents are spread over (changing it needs a re-index)
+    chroma_shards: int = Field(default=1, ge=1)
+    # Pick search candidates from the int8 shadow index, then rerank them in float32 (quantize.py)
+    search_int8: bool = False
+    # Persist embeddings in <chroma_dir>/embeddings_cache.sqlite, keyed by model + text hash
+    embedding_cache: bool = True
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
 
     # Helpful for consistent storage
     data_raw_dir: Path = Field(default_factory=lambda: _project_root() / "data" / "raw")
     data_processed_dir: Path = Field(default_factory=lambda: _project_root() / "data" / "processed")
 
+    def ensure_dirs(self) -> None:
+        """
+        Create data/vector store directories (safe, idempotent).
+        Called by commands that write, not at import time.
+        """
+        self.chroma_dir.mkdir(parents=True, exist_ok=True)
+        self.data_raw_dir.mkdir(parents=True, exist_ok=True)
+        self.data_processed_dir.mkdir(parents=True, exist_ok=True)
+
 
 def load_settings(env_file: Optional[Path] = None) -> Settings:
     """
@@ -51,7 +78,15 @@ def load_settings(env_file: Optional[Path] = None) -> Settings:
         "openai_api_key": os.getenv("OPENAI_API_KEY", ""),
         "openai_model": os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
         "openai_embedding_model": os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
+        "llm_concurrency": os.getenv("LLM_CONCURRENCY", "16"),
+        "llm_batch_size": os.getenv("LLM_BATCH_SIZE", "1"),
+        "llm_batch_max_tokens": os.getenv("LLM_BATCH_MAX_TOKENS", "12000"),
         "chroma_dir": os.getenv("CHROMA_DIR", str(_project_root() / "data" / "vectorstore")),
+        "chroma_host": os.getenv("CHROMA_HOST") or None,
+        "chroma_port": os.getenv("CHROMA_PORT", "8000"),
+        "chroma_shards": os.getenv("CHROMA_SHARDS", "1"),
+        "search_int8": os.getenv("SEARCH_INT8", "false"),
+        "embedding_cache": os.getenv("EMBEDDING_CACHE", "true"),
         "log_level": os.getenv("LOG_LEVEL", "INFO"),
         "data_raw_dir": os.getenv("DATA_RAW_DIR", str(_project_root() / "data" / "raw")),
         "data_processed_dir": os.getenv("DATA_PROCESSED_DIR", str(_project_root() / "data" / "processed")),
@@ -67,13 +102,16 @@ def load_settings(env_file: Optional[Path] = None) -> Settings:
             f"Details:\n{e}"
         ) from e
 
-    # Ensure directories exist (safe, idempotent)
-    settings.chroma_dir.mkdir(parents=True, exist_ok=True)
-    settings.data_raw_dir.mkdir(parents=True, exist_ok=True)
-    settings.data_processed_dir.mkdir(parents=True, exist_ok=True)
-
     return settings
 
 
-# Convenience singleton-style access (lazy load)
-settings = load_settings()
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings once per process.
+    """
+    return load_settings()
+
+
+# Convenience singleton-style access (kept for existing `from ... import settings`)
+settings = get_settings()
@@ -1,15 +1,32 @@
 from __future__ import annotations
 
+import atexit
+import functools
 import logging
-from typing import List
+from typing import List, Optional, Tuple
 
-from openai import OpenAI
+import openai
+from openai import AsyncOpenAI, OpenAI
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from news_scraper.config import settings
+from news_scraper.embedding_cache import EmbeddingCache
+from news_scraper.prompts import estimate_tokens
+from news_scraper.ratelimit import AdaptiveLimiter, create_with_limiter
 
 log = logging.getLogger("news_scraper.embeddings")
 
+# Per-request caps for the embeddings endpoint (max 2048 inputs; keep token totals well below the limit)
+MAX_BATCH_SIZE = 128
+MAX_BATCH_TOKENS = 100_000
+
+# Only these are worth retrying; bad input, auth or schema errors fail immediately
+TRANSIENT_ERRORS = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
 
 class EmbeddingsClient:
     """
@@ -18,14 +35,45 @@ class EmbeddingsClient:
 
     def __init__(self) -> None:
         self._client = OpenAI(api_key=settings.openai_api_key)
+        self._aclient = AsyncOpenAI(api_key=settings.openai_api_key)
         self._model = settings.openai_embedding_model
+        self._cache: Optional[EmbeddingCache] = None
+        if settings.embedding_cache:
+            self._cache = EmbeddingCache(settings.chroma_dir / "embeddings_cache.sqlite", self._model)
+
+    def close(self) -> None:
+        """
+        Close the sync HTTP connection pool and the embedding cache.
+        """
+        self._client.close()
+        if self._cache is not None:
+            self._cache.close()
+
+    def _cache_lookup(self, texts: List[str]) -> Tuple[List[Optional[List[float]]], List[str]]:
+        """
+        Returns (vectors with None for misses, texts that still need the API).
+        """
+        if self._cache is None:
+            return [None] * len(texts), texts
+
+        vectors = self._cache.get_many(texts)
+        missing = [t for t, v in zip(texts, vectors) if v is None]
+        if len(missing) < len(texts):
+            log.debug("Embedding cache: %d/%d hits", len(texts) - len(missing), len(texts))
+        return vectors, missing
+
+    def _cache_fill(
+        self, vectors: List[Optional[List[float]]], missing: List[str], new_vectors: List[List[float]]
+    ) -> List[List[float]]:
+        """
+        Store freshly embedded texts and fill them into the misses of `vectors`.
+        """
+        if self._cache is not None and missing:
+            self._cache.put_many(missing, new_vectors)
+
+        it = iter(new_vectors)
+        return [v if v is not None else next(it) for v in vectors]
 
-    @retry(
-        retry=retry_if_exception_type(Exception),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        stop=stop_after_attempt(3),
-        reraise=True,
-    )
     def embed_text(self, text: str) -> List[float]:
         """
         Generate a single embedding vector for the given text.
@@ -35,12 +83,115 @@ class EmbeddingsClient:
 
         log.debug("Embedding text (%d chars)", len(text))
 
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for many texts, in input order.
+        Texts are sent in as few requests as the batch size/token caps allow;
+        texts found in the embedding cache are not sent at all.
+        """
+        for text in texts:
+            if not text or not text.strip():
+                raise ValueError("Cannot embed empty text")
+
+        vectors, missing = self._cache_lookup(texts)
+
+        new_vectors: List[List[float]] = []
+        for batch in _split_batches(missing):
+            new_vectors.extend(self._embed_batch(batch))
+        return self._cache_fill(vectors, missing, new_vectors)
+
+    async def embed_texts_async(
+        self, texts: List[str], limiter: Optional[AdaptiveLimiter] = None
+    ) -> List[List[float]]:
+        """
+        Async variant of embed_texts, optionally bounded by a shared AdaptiveLimiter.
+        """
+        for text in texts:
+            if not text or not text.strip():
+                raise ValueError("Cannot embed empty text")
+
+        vectors, missing = self._cache_lookup(texts)
+
+        new_vectors: List[List[float]] = []
+        for batch in _split_batches(missing):
+            new_vectors.extend(await self._embed_batch_async(batch, limiter))
+        return self._cache_fill(vectors, missing, new_vectors)
+
+    @retry(
+        retry=retry_if_exception_type(TRANSIENT_ERRORS),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        stop=stop_after_attempt(3),
+        reraise=True,
+    )
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        log.debug("Embedding batch of %d texts", len(texts))
+
         resp = self._client.embeddings.create(
             model=self._model,
-            input=text,
+            input=texts,
+        )
+
+        return _vectors_in_order(resp, len(texts))
+
+    @retry(
+        retry=retry_if_exception_type(TRANSIENT_ERRORS),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        stop=stop_after_attempt(3),
+        reraise=True,
+    )
+    async def _embed_batch_async(
+        self, texts: List[str], limiter: Optional[AdaptiveLimiter] = None
+    ) -> List[List[float]]:
+        log.debug("Embedding batch of %d texts", len(texts))
+
+        resp = await create_with_limiter(
+            self._aclient.embeddings,
+            limiter,
+            model=self._model,
+            input=texts,
         )
 
-        try:
-            return resp.data[0].embedding
-        except Exception as e:
-            raise RuntimeError("Invalid embedding response") from e
+        return _vectors_in_order(resp, len(texts))
+
+
+def _vectors_in_order(resp, expected: int) -> List[List[float]]:
+    if len(resp.data) != expected:
+        raise RuntimeError("Invalid embedding response")
+    # The API returns items with an explicit index; don't rely on ordering
+    return [d.embedding for d in sorted(resp.data, key=lambda d: d.index)]
+
+
+@functools.lru_cache(maxsize=1)
+def get_embeddings_client() -> EmbeddingsClient:
+    """
+    Process-wide EmbeddingsClient, so repeated calls reuse the same HTTP connection pool.
+    """
+    return EmbeddingsClient()
+
+
+@atexit.register
+def _close_embeddings_client() -> None:
+    if get_embeddings_client.cache_info().currsize:
+        get_embeddings_client().close()
+        get_embeddings_client.cache_clear()
+
+
+def _split_batches(texts: List[str]) -> List[List[str]]:
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and (len(current) >= MAX_BATCH_SIZE or current_tokens + tokens > MAX_BATCH_TOKENS):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(text)
+        current_tokens += tokens
+
+    if current:
+        batches.append(current)
+    return batches
@@ -19,6 +19,9 @@ DEFAULT_HEADERS = {
     "Pragma": "no-cache",
 }
 
+# Shared pool sizing for sync + async fetchers; HTTP/2 multiplexes requests per host.
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
 
 @dataclass(frozen=True)
 class FetchResult:
@@ -29,6 +32,18 @@ class FetchResult:
     error: Optional[str] = None
 
 
+def _to_fetch_result(resp: httpx.Response) -> FetchResult:
+    content_type = resp.headers.get("content-type")
+    html = resp.text if resp.text else None
+
+    return FetchResult(
+        final_url=str(resp.url),
+        status_code=resp.status_code,
+        content_type=content_type,
+        html=html,
+    )
+
+
 class HttpFetcher:
     """
     Thin wrapper around httpx.Client with retries for transient network failures.
@@ -39,6 +54,8 @@ class HttpFetcher:
             headers=DEFAULT_HEADERS,
             timeout=httpx.Timeout(timeout_s),
             follow_redirects=follow_redirects,
+            http2=True,
+            limits=DEFAULT_LIMITS,
         )
 
     def close(self) -> None:
@@ -55,13 +72,35 @@ class HttpFetcher:
         Fetch a URL and return decoded HTML text (if any).
         Retries on network/timeout exceptions.
         """
-        resp = self._client.get(url)
-        content_type = resp.headers.get("content-type")
-        html = resp.text if resp.text else None
-
-        return FetchResult(
-            final_url=str(resp.url),
-            status_code=resp.status_code,
-            content_type=content_type,
-            html=html,
+        return _to_fetch_result(self._client.get(url))
+
+
+class HttpAsyncFetcher:
+    """
+    Async counterpart of HttpFetcher (httpx.AsyncClient), same headers, pool and retries.
+    """
+
+    def __init__(self, timeout_s: float = 20.0, follow_redirects: bool = True) -> None:
+        self._client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=httpx.Timeout(timeout_s),
+            follow_redirects=follow_redirects,
+            http2=True,
+            limits=DEFAULT_LIMITS,
         )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    @retry(
+        retry=retry_if_exception_type((httpx.TimeoutException, httpx.TransportError)),
+        wait=wait_exponential(multiplier=0.5, min=0.5, max=6),
+        stop=stop_after_attempt(3),
+        reraise=True,
+    )
+    async def fetch(self, url: str) -> FetchResult:
+        """
+        Fetch a URL and return decoded HTML text (if any).
+        Retries on network/timeout exceptions.
+        """
+        return _to_fetch_result(await self._client.get(url))
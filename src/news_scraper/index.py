@@ -1,39 +1,39 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
-from typing import Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
-from news_scraper.embeddings_client import EmbeddingsClient
+from news_scraper.embeddings_client import EmbeddingsClient, get_embeddings_client
 from news_scraper.io import iter_jsonl
-from news_scraper.models import ArticleAI
-from news_scraper.vectorstore_chroma import article_to_vector_doc
-from news_scraper.vectorstore_chroma import ChromaVectorStore
+from news_scraper.models import ArticleAI, VectorDocument
+from news_scraper.quantize import update_int8_index
+from news_scraper.ratelimit import AdaptiveLimiter
+from news_scraper.vectorstore_chroma import ChromaVectorStore, article_to_vector_doc
+from news_scraper.vectorstore_chroma import get_vector_store
 
 log = logging.getLogger("news_scraper.index")
 
+Batch = Tuple[List[VectorDocument], List[List[float]]]
 
-def index_ai_jsonl_to_chroma(
+
+async def _produce_docs(
     ai_file: Path,
-    limit: Optional[int] = None,
-) -> dict:
+    existing: Set[str],
+    limit: Optional[int],
+    doc_queue: "asyncio.Queue[Optional[VectorDocument]]",
+    counts: Dict[str, int],
+) -> None:
     """
-    Load AI-enriched JSONL and index into Chroma vector store.
-    Skips records that are not ok or missing summary/topics.
-    Skips URLs already indexed.
+    Stage 1: read + validate JSONL and queue documents that need indexing.
+    The end-of-input marker is only sent on success: if any stage fails, the
+    pipeline is cancelled instead (awaiting a put on a queue nobody drains
+    any more would hang the shutdown).
     """
-    store = ChromaVectorStore()
-    embeddings_client = EmbeddingsClient()
-
-    existing: Set[str] = store.existing_ids()
-
-    added = 0
-    skipped_existing = 0
-    skipped_ineligible = 0
-    failed = 0
-
+    queued = 0
     for obj in iter_jsonl(ai_file):
-        if limit is not None and added >= limit:
+        if limit is not None and queued >= limit:
             break
 
         try:
@@ -41,30 +41,200 @@ def index_ai_jsonl_to_chroma(
 
             # Only index successful AI outputs
             if art.status != "ok" or not art.summary:
-                skipped_ineligible += 1
+                counts["skipped_ineligible"] += 1
                 continue
 
             doc = article_to_vector_doc(art)
 
             if doc.id in existing:
-                skipped_existing += 1
+                counts["skipped_existing"] += 1
                 continue
 
-            vec = embeddings_client.embed_text(doc.text)
-            store.add_documents([doc], [vec])
+        except Exception as e:
+            counts["failed"] += 1
+            log.exception("Failed to index record: %s", e)
+            continue
+
+        existing.add(doc.id)
+        queued += 1
+        await doc_queue.put(doc)
+
+    await doc_queue.put(None)
 
-            existing.add(doc.id)
-            added += 1
 
+async def _embed_batches(
+    embedder: EmbeddingsClient,
+    existing: Set[str],
+    doc_queue: "asyncio.Queue[Optional[VectorDocument]]",
+    write_queue: "asyncio.Queue[Optional[Batch]]",
+    counts: Dict[str, int],
+    batch_size: int,
+    max_wait_s: float,
+    limiter: AdaptiveLimiter,
+) -> None:
+    """
+    Stage 2: collect up to batch_size documents (or whatever arrived within
+    max_wait_s), embed them in one request and hand them to the writer.
+    Up to limiter.max_limit requests are in flight; the limiter backs off
+    on rate limits.
+    """
+    loop = asyncio.get_running_loop()
+    done = False
+    pending: Set["asyncio.Task[None]"] = set()
+
+    async def _embed(batch: List[VectorDocument]) -> None:
+        try:
+            vecs = await embedder.embed_texts_async([d.text for d in batch], limiter)
         except Exception as e:
-            failed += 1
-            log.exception("Failed to index record: %s", e)
+            counts["failed"] += len(batch)
+            existing.difference_update(d.id for d in batch)
+            log.exception("Failed to embed batch of %d records: %s", len(batch), e)
+            return
+
+        await write_queue.put((batch, vecs))
+
+    while not done:
+        doc = await doc_queue.get()
+        if doc is None:
+            break
+
+        batch = [doc]
+        deadline = loop.time() + max_wait_s
+        while len(batch) < batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                doc = await asyncio.wait_for(doc_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if doc is None:
+                done = True
+                break
+            batch.append(doc)
+
+        if len(pending) >= limiter.max_limit:
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        pending.add(asyncio.create_task(_embed(batch)))
+
+    if pending:
+        await asyncio.gather(*pending)
+    await write_queue.put(None)
+
+
+def _add_documents(store: ChromaVectorStore, docs: List[VectorDocument], vecs: List[List[float]]) -> None:
+    store.add_documents(docs, vecs)
+    update_int8_index([d.id for d in docs], vecs)
+
+
+async def _write_batches(
+    store: ChromaVectorStore,
+    existing: Set[str],
+    write_queue: "asyncio.Queue[Optional[Batch]]",
+    counts: Dict[str, int],
+    add_batch_size: int,
+) -> None:
+    """
+    Stage 3: buffer embedded batches and add them to Chroma in bulk
+    (one collection.add per `add_batch_size` docs, in a worker thread
+    so embedding continues meanwhile).
+    """
+    docs_buf: List[VectorDocument] = []
+    vecs_buf: List[List[float]] = []
+
+    async def _flush() -> None:
+        try:
+            await asyncio.to_thread(_add_documents, store, list(docs_buf), list(vecs_buf))
+            counts["added"] += len(docs_buf)
+        except Exception as e:
+            counts["failed"] += len(docs_buf)
+            existing.difference_update(d.id for d in docs_buf)
+            log.exception("Failed to add batch of %d records: %s", len(docs_buf), e)
+        docs_buf.clear()
+        vecs_buf.clear()
+
+    while (item := await write_queue.get()) is not None:
+        docs, vecs = item
+        docs_buf.extend(docs)
+        vecs_buf.extend(vecs)
+        if len(docs_buf) >= add_batch_size:
+            await _flush()
+
+    if docs_buf:
+        await _flush()
+
+
+async def _index_pipeline(
+    ai_file: Path,
+    store: ChromaVectorStore,
+    embedder: EmbeddingsClient,
+    existing: Set[str],
+    limit: Optional[int],
+    batch_size: int,
+    max_wait_s: float,
+    add_batch_size: int,
+    embed_concurrency: int,
+    counts: Dict[str, int],
+) -> None:
+    doc_queue: asyncio.Queue[Optional[VectorDocument]] = asyncio.Queue(maxsize=256)
+    write_queue: asyncio.Queue[Optional[Batch]] = asyncio.Queue(maxsize=4)
+    limiter = AdaptiveLimiter(embed_concurrency)
+
+    await asyncio.gather(
+        _produce_docs(ai_file, existing, limit, doc_queue, counts),
+        _embed_batches(embedder, existing, doc_queue, write_queue, counts, batch_size, max_wait_s, limiter),
+        _write_batches(store, existing, write_queue, counts, add_batch_size),
+    )
+
+
+def index_ai_jsonl_to_chroma(
+    ai_file: Path,
+    limit: Optional[int] = None,
+    batch_size: int = 128,
+    max_wait_ms: float = 10.0,
+    add_batch_size: int = 256,
+    embed_concurrency: int = 4,
+) -> dict:
+    """
+    Load AI-enriched JSONL and index into Chroma vector store.
+    Skips records that are not ok or missing summary/topics.
+    Skips URLs already indexed.
+
+    Runs as a producer -> embedder -> Chroma writer pipeline: documents are
+    embedded in batches of up to `batch_size` (or whatever arrived within
+    `max_wait_ms`), up to `embed_concurrency` requests at a time (adapting to
+    rate limits), while earlier batches are still being written; Chroma
+    inserts are grouped into bulk adds of `add_batch_size` documents.
+    """
+    store = get_vector_store()
+    embeddings_client = get_embeddings_client()
+
+    existing: Set[str] = store.existing_ids()
+
+    counts = {
+        "added": 0,
+        "skipped_existing": 0,
+        "skipped_ineligible": 0,
+        "failed": 0,
+    }
+
+    asyncio.run(
+        _index_pipeline(
+            ai_file,
+            store,
+            embeddings_client,
+            existing,
+            limit,
+            batch_size,
+            max_wait_ms / 1000.0,
+            add_batch_size,
+            embed_concurrency,
+            counts,
+        )
+    )
 
     summary = {
-        "added": added,
-        "skipped_existing": skipped_existing,
-        "skipped_ineligible": skipped_ineligible,
-        "failed": failed,
+        **counts,
         "collection_dir": str(store.persist_dir),
     }
     log.info("Index finished: %s", summary)
@@ -6,12 +6,12 @@ from typing import Any, Dict, Optional
 from typing import Callable, Type, TypeVar
 
 from news_scraper.config import settings
-from news_scraper.embeddings_client import EmbeddingsClient
-from news_scraper.io import append_jsonl, iter_jsonl, load_seen_urls, normalize_url
-from news_scraper.llm_client import LLMClient
+from news_scraper.io import JsonlAppender, iter_jsonl_reverse, load_seen_urls, normalize_url
+from news_scraper.llm_client import get_llm_client
 from news_scraper.models import ArticleAI, ArticleRaw
+from news_scraper.quantize import update_int8_index
 from news_scraper.scrape import scrape_single_url_to_jsonl
-from news_scraper.vectorstore_chroma import ChromaVectorStore, article_to_vector_doc
+from news_scraper.vectorstore_chroma import articles_to_vector_docs, get_vector_store
 from news_scraper.analyze import analyze_one_article_raw, build_failed_ai_from_raw
 
 
@@ -28,25 +28,26 @@ def _find_latest_by_url(
 ) -> Optional[T]:
     """
     Return the most recent (last) record in JSONL matching URL and predicate.
+    JSONL is append-only, so scan newest-first and stop at the first hit.
     """
     if not jsonl_file.exists():
         return None
 
     target = normalize_url(url)
-    latest: Optional[T] = None
 
-    for obj in iter_jsonl(jsonl_file):
+    for obj in iter_jsonl_reverse(jsonl_file):
         u = obj.get("url")
         if not u:
             continue
-        if normalize_url(str(u)) != target:
+        # Stored URLs are usually already normalized: try the plain comparison first
+        if u != target and normalize_url(str(u)) != target:
             continue
 
         rec = model_cls.model_validate(obj)
         if is_ok(rec):
-            latest = rec
+            return rec
 
-    return latest
+    return None
 
 
 def ingest_url(
@@ -63,8 +64,7 @@ def ingest_url(
     - AI: we skip if URL already exists in AI JSONL (normalized)
     - Index: Chroma existing_ids prevents duplicates
     """
-    settings.data_raw_dir.mkdir(parents=True, exist_ok=True)
-    settings.data_processed_dir.mkdir(parents=True, exist_ok=True)
+    settings.ensure_dirs()
 
     raw_file = settings.data_raw_dir / "articles_raw.jsonl"
     ai_file = settings.data_processed_dir / "articles_ai.jsonl"
@@ -95,16 +95,17 @@ def ingest_url(
         return {"status": "failed", "stage": "scrape", "url": norm_url, "detail": scrape_res}
 
     # 2) ANALYZE targeted
-    client = LLMClient()
-    try:
-        enriched = analyze_one_article_raw(client, raw)
-        append_jsonl(ai_file, enriched.model_dump(mode="json"))
-        analyze_res = {"processed": 1, "failed": 0, "out_file": str(ai_file)}
-
-    except Exception as e:
-        failed_rec = build_failed_ai_from_raw(raw, client, e)
-        append_jsonl(ai_file, failed_rec.model_dump(mode="json"))
-        return {"status": "failed", "stage": "analyze", "url": norm_url, "detail": str(e)}
+    client = get_llm_client()
+    with JsonlAppender(ai_file) as writer:
+        try:
+            enriched = analyze_one_article_raw(client, raw)
+            writer.write(enriched.model_dump(mode="json"))
+            analyze_res = {"processed": 1, "failed": 0, "out_file": str(ai_file)}
+
+        except Exception as e:
+            failed_rec = build_failed_ai_from_raw(raw, client, e)
+            writer.write(failed_rec.model_dump(mode="json"))
+            return {"status": "failed", "stage": "analyze", "url": norm_url, "detail": str(e)}
 
     # 3) INDEX targeted
     ai = _find_latest_by_url(
@@ -117,7 +118,7 @@ def ingest_url(
     if ai is None:
         return {"status": "failed", "stage": "index", "url": norm_url, "detail": "No OK AI record after analysis."}
 
-    store = ChromaVectorStore()
+    store = get_vector_store()
     existing_ids = store.existing_ids()
     if norm_url in existing_ids:
         return {
@@ -129,10 +130,9 @@ def ingest_url(
             "index": {"added": 0, "skipped_existing": 1},
         }
 
-    doc = article_to_vector_doc(ai)
-    embedder = EmbeddingsClient()
-    vec = embedder.embed_text(doc.text)
-    store.add_documents([doc], [vec])
+    docs, vecs = articles_to_vector_docs([ai])
+    store.add_documents(docs, vecs)
+    update_int8_index([d.id for d in docs], vecs)
 
     return {
         "status": "ok",
@@ -1,86 +1,298 @@
 from __future__ import annotations
-from __future__ import annotations
-
-import json
-from typing import List
 
+import functools
+import logging
+import mmap
+import os
+import re
+from itertools import repeat
 from pathlib import Path
-from typing import Iterator, Any, Dict, Set
+from typing import Any, Dict, Iterator, List, NewType, Optional, Set, Tuple
 from urllib.parse import urlsplit, urlunsplit
 
+import orjson
+
+log = logging.getLogger("news_scraper.io")
+
 
-def normalize_url(url: str) -> str:
+# A URL that already went through normalize_url; functions taking one skip re-normalizing
+NormalizedUrl = NewType("NormalizedUrl", str)
+
+
+@functools.lru_cache(maxsize=1 << 17)
+def normalize_url(url: str) -> NormalizedUrl:
     """
     Normalize URL to avoid trivial duplicates:
     - trim whitespace
     - drop fragment (#...)
     - remove trailing slash for non-root paths
+
+    Pure function, memoized: the same URLs are normalized repeatedly across
+    dedup sets, JSONL scans and scraping.
     """
     url = url.strip()
+    # http(s) URLs: drop the fragment / trailing slash with plain str ops
+    # (urlsplit also strips embedded tabs/newlines, so those take the slow path)
+    if url.startswith(("http://", "https://")) and "\t" not in url and "\n" not in url and "\r" not in url:
+        base = url.partition("#")[0]
+        host_start = base.index("://") + 3
+        netloc_end = len(base)
+        for sep in "/?":
+            i = base.find(sep, host_start, netloc_end)
+            if i != -1:
+                netloc_end = i
+        netloc = base[host_start:netloc_end]
+        # urlunsplit drops an empty query and collapses an empty host, and urlsplit rejects
+        # malformed bracketed (IPv6) and some non-ASCII hosts; leave those to the slow path
+        if (
+            not base.endswith("?")
+            and not base.startswith("/", host_start)
+            and netloc.isascii()
+            and "[" not in netloc
+            and "]" not in netloc
+        ):
+            if base.endswith("/"):
+                path_start = base.find("/", host_start)
+                query_start = base.find("?", host_start)
+                if query_start != -1 and query_start < path_start:
+                    path = ""
+                else:
+                    path = base[path_start:query_start] if query_start != -1 else base[path_start:]
+                if path not in ("", "/"):
+                    base = base[:-1]
+            return NormalizedUrl(base)
+
     parts = urlsplit(url)
     parts = parts._replace(fragment="")
     normalized = urlunsplit(parts)
     if normalized.endswith("/") and parts.path not in ("", "/"):
         normalized = normalized[:-1]
-    return normalized
+    return NormalizedUrl(normalized)
+
+
+class SeenIndex:
+    """
+    Sidecar index of normalized URLs for a JSONL file: `<file>.urls`, one URL per line.
+
+    Lets dedup checks avoid rescanning the whole JSONL. The sidecar is trusted
+    only while it is not older than the JSONL file (mtime); otherwise it is
+    rebuilt from the JSONL on the next load.
+    """
+
+    def __init__(self, jsonl_path: Path) -> None:
+        self.jsonl_path = jsonl_path
+        self.path = jsonl_path.with_name(jsonl_path.name + ".urls")
+
+    def is_fresh(self) -> bool:
+        try:
+            return self.path.stat().st_mtime >= self.jsonl_path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+
+    def load(self) -> Set[str]:
+        if not self.jsonl_path.exists():
+            return set()
+        if self.is_fresh():
+            return set(self.path.read_text(encoding="utf-8").splitlines())
+        return self.rebuild()
+
+    def rebuild(self) -> Set[str]:
+        seen: Set[str] = {normalize_url(u) for u in _scan_urls(self.jsonl_path) if u}
+
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text("".join(u + "\n" for u in seen), encoding="utf-8")
+        os.replace(tmp, self.path)
+        return seen
+
+    def add(self, urls: List[str], truncate: bool = False) -> None:
+        """
+        Record URLs just appended to the JSONL file.
+        Call after the JSONL write so the sidecar mtime stays >= the JSONL mtime.
+        """
+        with self.path.open("w" if truncate else "a", encoding="utf-8") as f:
+            f.write("".join(u + "\n" for u in urls))
+
+
+# "url" string fields in raw JSONL bytes; the value may contain escapes (\" \/ \uXXXX)
+_URL_FIELD_RE = re.compile(rb'"url"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def _scan_urls(path: Path) -> Iterator[str]:
+    """
+    Yield the "url" values of a JSONL file without parsing the records:
+    one regex scan over an mmap of the file. Only values containing
+    escapes go through the JSON decoder.
+    """
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for m in _URL_FIELD_RE.finditer(mm):
+                raw = m.group(1)
+                if b"\\" in raw:
+                    yield orjson.loads(b'"' + raw + b'"')
+                else:
+                    yield raw.decode("utf-8")
+
+
+def _url_key(obj: Dict[str, Any]) -> Optional[str]:
+    u = obj.get("url")
+    return normalize_url(str(u)) if u else None
 
 
 def load_seen_urls(jsonl_path: Path) -> Set[str]:
     """
     Return set of normalized URLs present in a JSONL file (if it exists).
     Expects objects to have a 'url' field.
+    Served from the SeenIndex sidecar when it is up to date.
     """
-    if not jsonl_path.exists():
-        return set()
+    return SeenIndex(jsonl_path).load()
 
-    seen: Set[str] = set()
-    for obj in iter_jsonl(jsonl_path):
-        u = obj.get("url")
-        if not u:
-            continue
-        seen.add(normalize_url(str(u)))
-    return seen
+
+# jsonl path -> ((mtime_ns, size), normalized URLs), reused by contains_url until the file changes
+_seen_cache: Dict[Path, Tuple[Tuple[int, int], Set[str]]] = {}
 
 
 def contains_url(jsonl_path: Path, url: str) -> bool:
     """
-    Fast(ish) membership check for normalized URL in JSONL file.
+    Membership check for normalized URL in JSONL file.
+    The URL set comes from the SeenIndex sidecar and is cached in memory
+    until the file's mtime/size change, so repeated checks are O(1).
     """
-    target = normalize_url(url)
-    if not jsonl_path.exists():
+    try:
+        st = jsonl_path.stat()
+    except FileNotFoundError:
         return False
-    for obj in iter_jsonl(jsonl_path):
-        u = obj.get("url")
-        if u and normalize_url(str(u)) == target:
-            return True
-    return False
 
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _seen_cache.get(jsonl_path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, load_seen_urls(jsonl_path))
+        _seen_cache[jsonl_path] = cached
 
-def append_jsonl(path: Path, obj: Dict[str, Any]) -> None:
+    return normalize_url(url) in cached[1]
+
+
+_DUMPS_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+
+def _dumps_line(obj: Dict[str, Any]) -> bytes:
     """
-    Append one JSON object as one JSONL line.
+    Serialize one record to a JSONL line (UTF-8, non-ASCII kept as is, trailing newline).
+    Values orjson does not know natively (e.g. Path) are stringified.
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    line = json.dumps(obj, ensure_ascii=False)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(line + "\n")
-        f.flush()
+    return orjson.dumps(obj, default=str, option=_DUMPS_OPTIONS)
+
+
+class JsonlAppender:
+    """
+    Append JSON objects to a JSONL file through one buffered file handle.
+
+    Use it as a context manager around write loops (one record or many).
+    Data is flushed + fsynced on exit, and
+    optionally flushed every `flush_every` / fsynced every `fsync_every` records.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fsync_every: Optional[int] = None,
+        buffer_size: int = 1 << 20,
+        flush_every: Optional[int] = None,
+    ) -> None:
+        self.path = path
+        self._fsync_every = fsync_every
+        self._flush_every = flush_every
+        self._buffer_size = buffer_size
+        self._f = None
+        self._count = 0
+
+        self._seen = SeenIndex(path)
+        self._new_file = False
+        self._track_seen = False
+        self._new_urls: List[str] = []
+
+    def __enter__(self) -> "JsonlAppender":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Keep the sidecar in sync only if it is valid now (or the file is new);
+        # a stale sidecar stays stale and is rebuilt on the next load.
+        self._new_file = not self.path.exists()
+        self._track_seen = self._new_file or self._seen.is_fresh()
+
+        self._f = self.path.open("ab", buffering=self._buffer_size)
+        return self
+
+    def write(self, obj: Dict[str, Any]) -> None:
+        self._f.write(_dumps_line(obj))
+        self._count += 1
 
+        if self._track_seen:
+            key = _url_key(obj)
+            if key:
+                self._new_urls.append(key)
 
-def iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+        if self._fsync_every and self._count % self._fsync_every == 0:
+            self._sync()
+        elif self._flush_every and self._count % self._flush_every == 0:
+            self._f.flush()
+
+    def _sync(self) -> None:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._sync()
+        finally:
+            self._f.close()
+            self._f = None
+
+        if self._track_seen:
+            self._seen.add(self._new_urls, truncate=self._new_file)
+            self._new_urls = []
+
+
+def iter_jsonl(path: Path, chunk_size: int = 1 << 20) -> Iterator[Dict[str, Any]]:
     """
     Iterate JSONL as dictionaries.
     Skips empty lines.
+
+    Reads ~chunk_size bytes of whole lines per readlines(hint) call instead
+    of iterating lines one by one; orjson tolerates the trailing newline.
     """
     if not path.exists():
         raise FileNotFoundError(f"JSONL file not found: {path}")
 
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            yield json.loads(line)
+    with path.open("rb") as f:
+        while lines := f.readlines(chunk_size):
+            for line in lines:
+                if not line.isspace():
+                    yield orjson.loads(line)
+
+
+def iter_jsonl_reverse(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate JSONL as dictionaries, newest (last) line first.
+    Skips empty lines. Walks an mmap of the file backwards, so callers
+    looking for the latest record can stop without reading the rest.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"JSONL file not found: {path}")
+
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            while end > 0:
+                start = mm.rfind(b"\n", 0, end) + 1
+                line = mm[start:end]
+                if line and not line.isspace():
+                    yield orjson.loads(line)
+                end = start - 1
 
 
 def read_urls_from_file(path: Path) -> List[str]:
@@ -90,19 +302,31 @@ def read_urls_from_file(path: Path) -> List[str]:
     - ignores empty lines
     - ignores comments that start with '#'
     - deduplicates while preserving order
+    - skips (and logs) lines that are not valid UTF-8
     """
     if not path.exists():
         raise FileNotFoundError(f"URLs file not found: {path}")
 
-    seen = set()
-    urls: List[str] = []
+    # Pre-dedup raw lines in C (readlines chunks + dict.update) so each distinct
+    # line is decoded once, instead of a per-line Python loop over the whole file.
+    # bytes.strip only removes ASCII whitespace; the decoded text is stripped (and
+    # split on non-"\n" line breaks, like str.splitlines) below.
+    lines: Dict[bytes, None] = {}
+    with path.open("rb") as f:
+        while chunk := f.readlines(1 << 20):
+            lines.update(zip(map(bytes.strip, chunk), repeat(None)))
 
-    for raw_line in path.read_text(encoding="utf-8").splitlines():
-        line = raw_line.strip()
-        if not line or line.startswith("#"):
+    urls: Dict[str, None] = {}
+    for raw_line in lines:
+        try:
+            text = raw_line.decode("utf-8")
+        except UnicodeDecodeError:
+            log.warning("Skipping line that is not valid UTF-8 in %s: %r", path, raw_line[:200])
             continue
-        if line not in seen:
-            seen.add(line)
-            urls.append(line)
 
-    return urls
+        for part in text.splitlines():
+            line = part.strip()
+            if line and not line.startswith("#"):
+                urls.setdefault(line, None)
+
+    return list(urls)
@@ -1,69 +1,284 @@
 from __future__ import annotations
 
+import functools
 import logging
-import json
-from openai import OpenAI
+import time
+from typing import Any, Dict, List, Optional
+
+import msgspec
+import orjson
+from openai import AsyncOpenAI, OpenAI
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from news_scraper.config import settings
 from news_scraper.prompts import SYSTEM_PROMPT
 from news_scraper.models import LLMArticleAnalysis
+from news_scraper.ratelimit import AdaptiveLimiter, create_with_limiter
 
 log = logging.getLogger("news_scraper.llm")
 
 
+class _LLMBatchOutput(msgspec.Struct):
+    articles: List[LLMArticleAnalysis]
+
+
+# Decoders are reusable and cheaper than building one per call
+_ANALYSIS_DECODER = msgspec.json.Decoder(LLMArticleAnalysis)
+_BATCH_DECODER = msgspec.json.Decoder(_LLMBatchOutput)
+
+
 def parse_llm_output(raw_text: str) -> LLMArticleAnalysis:
     """
     Parse and validate raw LLM output.
     Raises ValueError if JSON or schema is invalid.
     """
     try:
-        data = json.loads(raw_text)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON from LLM: {e}") from e
+        return _ANALYSIS_DECODER.decode(raw_text)
+    except msgspec.DecodeError as e:
+        raise ValueError(f"Invalid LLM output: {e}") from e
+
+
+def parse_llm_batch_output(raw_text: str, expected: int) -> List[LLMArticleAnalysis]:
+    """
+    Parse and validate raw LLM output for a multi-article prompt.
+    Raises ValueError if JSON, schema or item count is invalid.
+    """
+    try:
+        items = _BATCH_DECODER.decode(raw_text).articles
+    except msgspec.DecodeError as e:
+        raise ValueError(f"Invalid LLM batch output: {e}") from e
+
+    if len(items) != expected:
+        raise ValueError(f"LLM batch output has {len(items)} items, expected {expected}")
+
+    return items
+
+
+def _extract_output_text(response) -> str:
+    """
+    Extract text output from a Responses API result.
+    """
+    try:
+        return response.output_text
+    except Exception:
+        raise RuntimeError("LLM response did not contain text output")
+
+
+def _output_text_from_body(body: Dict[str, Any]) -> str:
+    """
+    Extract text output from a raw Responses API body (as returned in Batch API output files).
+    """
+    texts = [
+        part.get("text", "")
+        for item in body.get("output") or []
+        if item.get("type") == "message"
+        for part in item.get("content") or []
+        if part.get("type") == "output_text"
+    ]
+    if not texts:
+        raise RuntimeError("LLM response did not contain text output")
+    return "".join(texts)
+
 
-    return LLMArticleAnalysis.model_validate(data)
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# Batch API caps per job: 50,000 requests and a 200 MB input file (kept with some margin)
+BATCH_MAX_REQUESTS = 50_000
+BATCH_MAX_FILE_BYTES = 190 * 1024 * 1024
 
 
 class LLMClient:
     """
     Thin, safe wrapper around OpenAI for article analysis.
+    Holds a sync and an async OpenAI client sharing the same settings.
     """
 
     def __init__(self) -> None:
         self._client = OpenAI(api_key=settings.openai_api_key)
+        self._aclient = AsyncOpenAI(api_key=settings.openai_api_key)
         self._model = settings.openai_model
 
+    def _request_kwargs(self, prompt: str, max_output_tokens: int = 400) -> dict:
+        return {
+            "model": self._model,
+            "input": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.2,
+            "max_output_tokens": max_output_tokens,
+        }
+
     @retry(
         retry=retry_if_exception_type(Exception),
         wait=wait_exponential(multiplier=1, min=1, max=10),
         stop=stop_after_attempt(3),
         reraise=True,
     )
-    def analyze_article(self, prompt: str):
+    def analyze_article(self, prompt: str) -> LLMArticleAnalysis:
         """
         Send prompt to LLM and return validated LLMArticleAnalysis.
         Retries on transient failures.
         """
-        log.debug("Sending prompt to LLM (%s chars)", len(prompt))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Sending prompt to LLM (%s chars)", len(prompt))
 
-        response = self._client.responses.create(
-            model=self._model,
-            input=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-            max_output_tokens=400,
-        )
+        response = self._client.responses.create(**self._request_kwargs(prompt))
+        raw_text = _extract_output_text(response)
 
-        # Extract text output safely
-        try:
-            raw_text = response.output_text
-        except Exception:
-            raise RuntimeError("LLM response did not contain text output")
-
-        log.debug("Raw LLM output: %s", raw_text)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Raw LLM output: %s", raw_text)
 
         # Parse + validate strictly
         return parse_llm_output(raw_text)
+
+    @retry(
+        retry=retry_if_exception_type(Exception),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        stop=stop_after_attempt(3),
+        reraise=True,
+    )
+    async def analyze_article_async(
+        self, prompt: str, limiter: Optional[AdaptiveLimiter] = None
+    ) -> LLMArticleAnalysis:
+        """
+        Async variant of analyze_article, so many articles can be in flight at once.
+        Same retry policy (tenacity switches to async sleeps for coroutines).
+        Pass a shared AdaptiveLimiter to bound concurrency by the account's rate limits.
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Sending prompt to LLM (%s chars)", len(prompt))
+
+        response = await create_with_limiter(self._aclient.responses, limiter, **self._request_kwargs(prompt))
+        raw_text = _extract_output_text(response)
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Raw LLM output: %s", raw_text)
+
+        return parse_llm_output(raw_text)
+
+    @retry(
+        retry=retry_if_exception_type(Exception),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        stop=stop_after_attempt(3),
+        reraise=True,
+    )
+    async def analyze_articles_batch_async(
+        self, prompt: str, expected: int, limiter: Optional[AdaptiveLimiter] = None
+    ) -> List[LLMArticleAnalysis]:
+        """
+        Send one multi-article prompt (see build_batch_analysis_prompt) and
+        return one validated LLMArticleAnalysis per article, in input order.
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Sending batch prompt to LLM (%d articles, %s chars)", expected, len(prompt))
+
+        response = await create_with_limiter(
+            self._aclient.responses, limiter, **self._request_kwargs(prompt, 400 * expected)
+        )
+        raw_text = _extract_output_text(response)
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Raw LLM batch output: %s", raw_text)
+
+        return parse_llm_batch_output(raw_text, expected)
+
+    def submit_batches(self, prompts: Dict[str, str]) -> List[str]:
+        """
+        Submit prompts (custom_id -> prompt) as OpenAI Batch API jobs, split so each
+        input file stays under BATCH_MAX_REQUESTS lines and BATCH_MAX_FILE_BYTES.
+        Returns the batch ids, in submission order.
+        """
+        batch_ids: List[str] = []
+        lines: List[bytes] = []
+        size = 0
+
+        for custom_id, prompt in prompts.items():
+            line = orjson.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/responses",
+                    "body": self._request_kwargs(prompt),
+                },
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+            if lines and (len(lines) >= BATCH_MAX_REQUESTS or size + len(line) > BATCH_MAX_FILE_BYTES):
+                batch_ids.append(self._submit_batch_file(lines))
+                lines = []
+                size = 0
+            lines.append(line)
+            size += len(line)
+
+        if lines:
+            batch_ids.append(self._submit_batch_file(lines))
+        return batch_ids
+
+    def _submit_batch_file(self, lines: List[bytes]) -> str:
+        input_file = self._client.files.create(file=("batch_input.jsonl", b"".join(lines)), purpose="batch")
+        batch = self._client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/responses",
+            completion_window="24h",
+        )
+        log.info("Submitted batch %s (%d requests)", batch.id, len(lines))
+        return batch.id
+
+    def wait_for_batch(self, batch_id: str, poll_interval_s: float = 30.0):
+        """
+        Poll a batch until it reaches a terminal status and return it.
+        """
+        while True:
+            batch = self._client.batches.retrieve(batch_id)
+            if batch.status in BATCH_TERMINAL_STATUSES:
+                log.info("Batch %s finished with status %s", batch_id, batch.status)
+                return batch
+
+            log.info("Batch %s status: %s", batch_id, batch.status)
+            time.sleep(poll_interval_s)
+
+    def fetch_batch_results(self, batch) -> Dict[str, Any]:
+        """
+        Download batch output/error files.
+        Returns custom_id -> LLMArticleAnalysis on success, or an Exception describing the failure.
+        """
+        results: Dict[str, Any] = {}
+
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+
+            content = self._client.files.content(file_id).text
+            for line in content.splitlines():
+                if not line.strip():
+                    continue
+                obj = orjson.loads(line)
+                results[obj["custom_id"]] = _batch_line_to_result(obj)
+
+        return results
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm_client() -> LLMClient:
+    """
+    Process-wide LLMClient, so repeated calls reuse the same HTTP connection pools.
+    """
+    return LLMClient()
+
+
+def _batch_line_to_result(obj: Dict[str, Any]) -> Any:
+    """
+    Convert one Batch API output line into LLMArticleAnalysis or an Exception.
+    """
+    error: Optional[Dict[str, Any]] = obj.get("error")
+    if error:
+        return RuntimeError(f"batch error: {error.get('code')}: {error.get('message')}")
+
+    response = obj.get("response") or {}
+    if response.get("status_code") != 200:
+        return RuntimeError(f"batch request failed with HTTP {response.get('status_code')}")
+
+    try:
+        return parse_llm_output(_output_text_from_body(response.get("body") or {}))
+    except Exception as e:
+        return e
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
-from typing import List
+from typing import List, Optional
 
-from pydantic import BaseModel, Field, HttpUrl, field_validator
+import msgspec
+from pydantic import BaseModel, Field, HttpUrl
 
 
 def utc_now_iso() -> str:
@@ -46,49 +47,38 @@ class ArticleAI(ArticleRaw):
     llm_model: Optional[str] = None
 
 
-class VectorDocument(BaseModel):
+@dataclass(slots=True)
+class VectorDocument:
     """
     Single document stored in the vector database.
+    Built internally from validated ArticleAI records, so a plain dataclass.
     """
 
-    id: str = Field(..., description="Stable unique ID (usually URL)")
-    text: str = Field(..., description="Text used for embedding")
-    metadata: dict = Field(default_factory=dict)
+    id: str  # stable unique ID (usually URL)
+    text: str  # text used for embedding
+    metadata: dict = field(default_factory=dict)
 
 
-class LLMArticleAnalysis(BaseModel):
+class LLMArticleAnalysis(msgspec.Struct):
     """
     Strict schema for LLM output.
-    The LLM MUST return JSON that conforms to this model.
-    """
+    The LLM MUST return JSON that conforms to this model:
+    - summary: concise summary of the article in 3–5 sentences
+    - topics: 3–7 short topic tags, lowercase, no duplicates
 
-    summary: str = Field(
-        ...,
-        description="Concise summary of the article in 3–5 sentences."
-    )
+    A msgspec Struct, so LLM JSON is parsed and type-checked in one pass
+    (see llm_client.parse_llm_output); values are cleaned in __post_init__.
+    """
 
-    topics: List[str] = Field(
-        ...,
-        description="3–7 short topic tags, lowercase, no duplicates."
-    )
+    summary: str
+    topics: List[str]
 
-    @field_validator("summary")
-    @classmethod
-    def summary_not_empty(cls, v: str) -> str:
-        if not v.strip():
+    def __post_init__(self) -> None:
+        self.summary = self.summary.strip()
+        if not self.summary:
             raise ValueError("summary must not be empty")
-        return v.strip()
-
-    @field_validator("topics")
-    @classmethod
-    def validate_topics(cls, v: List[str]) -> List[str]:
-        cleaned = []
-        for t in v:
-            t = t.strip().lower()
-            if t and t not in cleaned:
-                cleaned.append(t)
 
+        cleaned = list(dict.fromkeys(t2 for t in self.topics if (t2 := t.strip().lower())))
         if not (3 <= len(cleaned) <= 7):
             raise ValueError("topics must contain between 3 and 7 items")
-
-        return cleaned
\ No newline at end of file
+        self.topics = cleaned
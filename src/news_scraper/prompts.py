@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from news_scraper.models import ArticleRaw
 
 
@@ -9,28 +11,84 @@ Do not include explanations, markdown, or extra text.
 """
 
 
+# Constant parts of the single-article prompt, joined around title/text per call
+_PROMPT_HEAD = """Analyze the following news article and return a JSON object with this exact structure:
+
+{
+  "summary": "3–5 sentence concise summary",
+  "topics": ["topic1", "topic2", "topic3"]
+}
+
+Rules:
+- Output ONLY JSON
+- No markdown
+- No trailing text
+- Topics must be 3–7 short lowercase strings
+
+Article title:
+"""
+
+_PROMPT_MID = """
+
+Article text:
+"""
+
+
 def build_article_analysis_prompt(article: ArticleRaw) -> str:
     """
     Build a strict prompt instructing the LLM to output JSON
     matching LLMArticleAnalysis schema.
     """
+    return "".join((_PROMPT_HEAD, str(article.title), _PROMPT_MID, str(article.text))).rstrip()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 chars per token for English text).
+    Good enough for budgeting requests; not an exact tokenizer count.
+    """
+    return len(text) // 4 + 1
+
+
+def build_batch_analysis_prompt(articles: Sequence[ArticleRaw]) -> str:
+    """
+    Build one prompt covering several articles.
+    The LLM must return {"articles": [...]} with one LLMArticleAnalysis object
+    per input article, in input order.
+    """
+    blocks = []
+    for i, article in enumerate(articles, start=1):
+        blocks.append(
+            f"""### Article {i}
+
+Article title:
+{article.title}
+
+Article text:
+{article.text}"""
+        )
+
+    joined = "\n\n".join(blocks)
+    n = len(articles)
+
     return f"""
-Analyze the following news article and return a JSON object with this exact structure:
+Analyze each of the following {n} news articles and return a JSON object with this exact structure:
 
 {{
-  "summary": "3–5 sentence concise summary",
-  "topics": ["topic1", "topic2", "topic3"]
+  "articles": [
+    {{
+      "summary": "3–5 sentence concise summary",
+      "topics": ["topic1", "topic2", "topic3"]
+    }}
+  ]
 }}
 
 Rules:
 - Output ONLY JSON
 - No markdown
 - No trailing text
+- "articles" must contain exactly {n} objects, one per article, in the same order
 - Topics must be 3–7 short lowercase strings
 
-Article title:
-{article.title}
-
-Article text:
-{article.text}
+{joined}
 """.strip()
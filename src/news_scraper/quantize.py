@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import functools
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+
+from news_scraper.config import settings
+from news_scraper.vectorstore_chroma import ChromaVectorStore, get_vector_store, l2_normalize
+
+log = logging.getLogger("news_scraper.quantize")
+
+# Page size when exporting embeddings from Chroma in rebuild()
+_PAGE_SIZE = 8192
+# Rows of codes scored per step of the int8 scan (keeps the float32 copy cache-sized)
+_SCAN_ROWS = 16384
+
+
+def quantize_int8(vectors: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-vector symmetric scalar quantization: v ~= codes * scale.
+    Returns (int8 codes [N, d], float32 scales [N]).
+    """
+    arr = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    max_abs = np.abs(arr).max(axis=1)
+    max_abs[max_abs == 0] = 1.0
+    scales = max_abs / 127.0
+    codes = np.clip(np.round(arr / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class Int8ShadowIndex:
+    """
+    int8 copy of the store's embeddings, appended to as documents are indexed:
+    `<chroma_dir>/<collection>.int8.codes` (raw int8 rows, memory-mapped),
+    `.int8.scales` (float32 per row), `.int8.ids` (one ID per line) and
+    `.int8.meta.json` (dimension). The ID file is written last, so its line
+    count is the number of complete rows.
+
+    Search scans the int8 codes (a quarter of the float32 bytes) for the
+    top_k * oversample candidates, then fetches only those embeddings from Chroma
+    and reranks them exactly in float32. Distances are 1 - cosine similarity.
+    If the shadow index does not cover the whole store (e.g. enabled after
+    indexing), results come straight from Chroma until `build-int8-index` is run.
+    """
+
+    def __init__(self, store: ChromaVectorStore) -> None:
+        self.store = store
+        base = store.persist_dir / f"{store.collection_name}.int8"
+        self.codes_path = base.with_name(base.name + ".codes")
+        self.scales_path = base.with_name(base.name + ".scales")
+        self.ids_path = base.with_name(base.name + ".ids")
+        self.meta_path = base.with_name(base.name + ".meta.json")
+
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._codes: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._ids: List[str] = []
+        self._warned_stale = False
+
+    def _refresh(self) -> None:
+        """
+        (Re)map the files if the ID file changed since the last load
+        (e.g. another process appended to it).
+        """
+        try:
+            st = self.ids_path.stat()
+        except FileNotFoundError:
+            self._stamp, self._codes, self._scales, self._ids = None, None, None, []
+            return
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return
+
+        ids = self.ids_path.read_text(encoding="utf-8").splitlines()
+        n = len(ids)
+        if n:
+            dim = orjson.loads(self.meta_path.read_bytes())["dim"]
+            self._codes = np.memmap(self.codes_path, dtype=np.int8, mode="r", shape=(n, dim))
+            self._scales = np.fromfile(self.scales_path, dtype=np.float32, count=n)
+        else:
+            self._codes, self._scales = None, None
+        self._ids = ids
+        self._stamp = stamp
+
+    def add(self, ids: Sequence[str], embeddings: Any) -> None:
+        """
+        Append newly indexed vectors (same IDs/embeddings passed to the store).
+        """
+        if not ids:
+            return
+        codes, scales = quantize_int8(l2_normalize(embeddings))
+
+        if not self.meta_path.exists():
+            self.meta_path.write_bytes(orjson.dumps({"dim": codes.shape[1]}))
+        with self.codes_path.open("ab") as f:
+            f.write(codes.tobytes())
+        with self.scales_path.open("ab") as f:
+            f.write(scales.tobytes())
+        with self.ids_path.open("a", encoding="utf-8") as f:
+            f.write("".join(i + "\n" for i in ids))
+
+    def rebuild(self) -> int:
+        """
+        Re-export every embedding from Chroma (paged) into fresh shadow files.
+        Offline operation: run via `build-int8-index`, not from the query path.
+        Returns the number of vectors.
+        """
+        tmp_paths = {p: p.with_name(p.name + ".tmp") for p in (self.codes_path, self.scales_path, self.ids_path)}
+        n = 0
+        dim = 0
+        with (
+            tmp_paths[self.codes_path].open("wb") as fc,
+            tmp_paths[self.scales_path].open("wb") as fs,
+            tmp_paths[self.ids_path].open("w", encoding="utf-8") as fi,
+        ):
+            for collection in self.store._shards:
+                for offset in range(0, collection.count(), _PAGE_SIZE):
+                    got = collection.get(include=["embeddings"], limit=_PAGE_SIZE, offset=offset)
+                    if not len(got["ids"]):
+                        break
+                    codes, scales = quantize_int8(l2_normalize(got["embeddings"]))
+                    fc.write(codes.tobytes())
+                    fs.write(scales.tobytes())
+                    fi.write("".join(str(i) + "\n" for i in got["ids"]))
+                    n += len(got["ids"])
+                    dim = codes.shape[1]
+
+        # No vectors, no dimension: the next add() writes it
+        if n:
+            self.meta_path.write_bytes(orjson.dumps({"dim": dim}))
+        else:
+            self.meta_path.unlink(missing_ok=True)
+        # IDs last: a crash before this leaves the old, consistent index in place
+        for path in (self.codes_path, self.scales_path, self.ids_path):
+            os.replace(tmp_paths[path], path)
+
+        log.info("Built int8 shadow index: %d vectors", n)
+        return n
+
+    def _scan(self, query_vec: np.ndarray, n_candidates: int) -> List[str]:
+        """
+        IDs of the n_candidates rows with the highest int8 dot product.
+        """
+        q8, _ = quantize_int8(query_vec)
+        q = q8[0].astype(np.float32)
+        scores = np.empty(len(self._ids), dtype=np.float32)
+        for start in range(0, len(self._ids), _SCAN_ROWS):
+            block = self._codes[start : start + _SCAN_ROWS]
+            scores[start : start + len(block)] = block.astype(np.float32) @ q
+        scores *= self._scales
+
+        if n_candidates < len(scores):
+            rows = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+        else:
+            rows = np.arange(len(scores))
+        return [self._ids[row] for row in rows]
+
+    def query(
+        self,
+        query_vec: Any,
+        top_k: int,
+        oversample: int = 4,
+        include: Sequence[str] = ("distances", "documents", "metadatas"),
+    ) -> Dict[str, Any]:
+        """
+        Query one (L2-normalized) vector; returns a Chroma-shaped result
+        (ids + distances and the other `include` fields, for a single query).
+        """
+        fields = [k for k in ("documents", "metadatas") if k in include]
+
+        self._refresh()
+        if not self._ids or len(self._ids) < self.store.count():
+            if not self._warned_stale:
+                log.warning("int8 shadow index is incomplete; run `build-int8-index`. Serving Chroma results as is.")
+                self._warned_stale = True
+            results = self.store.query([query_vec], n_results=top_k, include=["distances", *fields])
+            return {key: results[key] for key in ("ids", "distances", *fields)}
+
+        query_vec = np.asarray(query_vec, dtype=np.float32)
+        got = self.store.get(self._scan(query_vec, top_k * oversample), include=["embeddings", *fields])
+
+        sims = l2_normalize(got["embeddings"]) @ query_vec if len(got["ids"]) else np.empty(0, dtype=np.float32)
+        order = np.argsort(-sims, kind="stable")[:top_k]
+
+        result = {key: [[got[key][i] for i in order]] for key in ("ids", *fields)}
+        result["distances"] = [[float(1.0 - sims[i]) for i in order]]
+        return result
+
+
+@functools.lru_cache(maxsize=1)
+def get_int8_index() -> Int8ShadowIndex:
+    return Int8ShadowIndex(get_vector_store())
+
+
+def update_int8_index(ids: Sequence[str], embeddings: Any) -> None:
+    """
+    Keep the shadow index in step with the store; no-op unless SEARCH_INT8 is on.
+    """
+    if settings.search_int8:
+        get_int8_index().add(ids, embeddings)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, List, Mapping, Optional
+
+import openai
+
+log = logging.getLogger("news_scraper.ratelimit")
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+class AdaptiveLimiter:
+    """
+    Async concurrency limiter whose capacity follows OpenAI rate limits (AIMD):
+    - after each response, shrink by half if x-ratelimit-remaining-{requests,tokens}
+      is below `low_watermark` of the limit, otherwise grow by one slot
+    - on HTTP 429, shrink by half
+    Endpoints that don't send rate-limit headers fall back to plain AIMD.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, low_watermark: float = 0.1) -> None:
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.limit = max_limit
+        self._low_watermark = low_watermark
+        self._in_flight = 0
+        self._waiters: List[asyncio.Future] = []
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        while self._in_flight >= self.limit:
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                # woken, but cancelled before taking the slot: pass the wake-up on
+                if fut.done() and not fut.cancelled():
+                    self._waiters.remove(fut)
+                    self._wake()
+                raise
+            finally:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+        self._in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.limit - self._in_flight
+        for fut in list(self._waiters):
+            if free <= 0:
+                break
+            if not fut.done():
+                fut.set_result(None)
+                free -= 1
+
+    def _decrease(self) -> None:
+        new_limit = max(self.min_limit, self.limit // 2)
+        if new_limit != self.limit:
+            log.debug("Concurrency limit %d -> %d", self.limit, new_limit)
+            self.limit = new_limit
+
+    def _increase(self) -> None:
+        if self.limit < self.max_limit:
+            self.limit += 1
+            self._wake()
+
+    def on_response(self, headers: Mapping[str, str]) -> None:
+        ratios = []
+        for kind in ("requests", "tokens"):
+            remaining = _header_int(headers, f"x-ratelimit-remaining-{kind}")
+            limit = _header_int(headers, f"x-ratelimit-limit-{kind}")
+            if remaining is not None and limit:
+                ratios.append(remaining / limit)
+
+        if ratios and min(ratios) < self._low_watermark:
+            self._decrease()
+        else:
+            self._increase()
+
+    def on_rate_limited(self) -> None:
+        self._decrease()
+
+
+async def create_with_limiter(resource: Any, limiter: Optional[AdaptiveLimiter], **kwargs: Any) -> Any:
+    """
+    Call `resource.create(**kwargs)` on an async OpenAI resource (e.g. client.responses)
+    inside `limiter`, feeding it the response rate-limit headers.
+    Without a limiter this is a plain create call.
+    """
+    if limiter is None:
+        return await resource.create(**kwargs)
+
+    async with limiter:
+        try:
+            raw = await resource.with_raw_response.create(**kwargs)
+        except openai.RateLimitError:
+            limiter.on_rate_limited()
+            raise
+
+        limiter.on_response(raw.headers)
+        return raw.parse()
@@ -1,23 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-import time
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
+from html import unescape as html_unescape
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse
 
 import httpx
 import trafilatura
 from bs4 import BeautifulSoup
 
-from news_scraper.http_client import HttpFetcher
-from news_scraper.io import append_jsonl, load_seen_urls, normalize_url
+from news_scraper.http_client import FetchResult, HttpAsyncFetcher, HttpFetcher
+from news_scraper.io import JsonlAppender, NormalizedUrl, load_seen_urls, normalize_url
 from news_scraper.io import read_urls_from_file
 from news_scraper.models import ArticleRaw
 
 log = logging.getLogger("news_scraper.scrape")
 
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
 
 @dataclass(frozen=True)
 class ExtractedArticle:
@@ -66,7 +71,12 @@ def extract_article(url: str, html: str, min_chars: int = 500) -> ExtractedArtic
     except Exception:
         text = None
 
-    # Fallback title
+    # Fallback title: cheap regex probe first, full BeautifulSoup parse only if that fails
+    if not title:
+        m = _TITLE_RE.search(html)
+        if m:
+            title = html_unescape(m.group(1)).strip() or None
+
     if not title:
         try:
             soup = BeautifulSoup(html, "lxml")
@@ -82,48 +92,171 @@ def extract_article(url: str, html: str, min_chars: int = 500) -> ExtractedArtic
     return ExtractedArticle(url=url, source=source, title=title, text=text, chars=chars)
 
 
-def _scrape_one_url(fetcher: HttpFetcher, url: str, *, min_chars: int) -> ArticleRaw:
+def _fill_from_extracted(record: ArticleRaw, extracted: ExtractedArticle, *, min_chars: int) -> ArticleRaw:
+    record.source = extracted.source
+    record.title = extracted.title
+    record.text = extracted.text
+    record.chars = extracted.chars
+
+    if extracted.text is None:
+        record.status = "failed"
+        record.error = f"Extraction too short (<{min_chars} chars)"
+    else:
+        record.status = "ok"
+
+    return record
+
+
+def _fill_from_fetch(record: ArticleRaw, result: FetchResult) -> bool:
+    """
+    Copy fetch metadata onto the record. Returns False (record marked failed)
+    if there is no HTML to extract from.
+    """
+    record.http_status = result.status_code
+    record.content_type = result.content_type
+
+    if not result.html:
+        record.status = "failed"
+        record.error = "Empty HTML response"
+        return False
+    return True
+
+
+def _fill_from_error(record: ArticleRaw, e: Exception) -> ArticleRaw:
+    record.status = "failed"
+    if isinstance(e, httpx.HTTPError):
+        record.error = f"http error: {type(e).__name__}: {e}"
+    else:
+        record.error = f"unexpected error: {type(e).__name__}: {e}"
+    return record
+
+
+def _scrape_one_url(fetcher: HttpFetcher, url: NormalizedUrl, *, min_chars: int) -> ArticleRaw:
     """
-    Core scraping logic for a single URL. No file IO here.
+    Core scraping logic for a single (already normalized) URL. No file IO here.
     Always returns ArticleRaw with status 'ok' or 'failed'.
     """
-    url_norm = normalize_url(url)
-    record = ArticleRaw(url=url_norm)
+    record = ArticleRaw(url=url)
 
     try:
-        result = fetcher.fetch(url_norm)
-        record.http_status = result.status_code
-        record.content_type = result.content_type
-
-        if not result.html:
-            record.status = "failed"
-            record.error = "Empty HTML response"
+        result = fetcher.fetch(url)
+        if not _fill_from_fetch(record, result):
             return record
 
         extracted = extract_article(result.final_url, result.html, min_chars=min_chars)
+        return _fill_from_extracted(record, extracted, min_chars=min_chars)
 
-        record.source = extracted.source
-        record.title = extracted.title
-        record.text = extracted.text
-        record.chars = extracted.chars
+    except Exception as e:
+        return _fill_from_error(record, e)
 
-        if extracted.text is None:
-            record.status = "failed"
-            record.error = f"Extraction too short (<{min_chars} chars)"
-        else:
-            record.status = "ok"
 
-        return record
+async def _scrape_one_url_async(
+    fetcher: HttpAsyncFetcher,
+    url: NormalizedUrl,
+    *,
+    min_chars: int,
+    executor: Optional[Executor] = None,
+) -> ArticleRaw:
+    """
+    Async variant of _scrape_one_url. CPU-bound extraction runs in `executor`
+    (a process pool in the batch pipeline; a worker thread if None) so the
+    event loop keeps other downloads moving.
+    """
+    record = ArticleRaw(url=url)
+
+    try:
+        result = await fetcher.fetch(url)
+        if not _fill_from_fetch(record, result):
+            return record
 
-    except httpx.HTTPError as e:
-        record.status = "failed"
-        record.error = f"http error: {type(e).__name__}: {e}"
-        return record
+        loop = asyncio.get_running_loop()
+        extracted = await loop.run_in_executor(executor, extract_article, result.final_url, result.html, min_chars)
+        return _fill_from_extracted(record, extracted, min_chars=min_chars)
 
     except Exception as e:
-        record.status = "failed"
-        record.error = f"unexpected error: {type(e).__name__}: {e}"
-        return record
+        return _fill_from_error(record, e)
+
+
+async def fetch_many(
+    urls: List[NormalizedUrl],
+    queue: "asyncio.Queue[Optional[ArticleRaw]]",
+    *,
+    min_chars: int = 500,
+    concurrency: int = 32,
+    sleep_s: float = 0.0,
+    executor: Optional[Executor] = None,
+) -> None:
+    """
+    Scrape URLs (already normalized) with at most `concurrency` requests in flight
+    and put each ArticleRaw on `queue` as soon as it is ready. Puts None when done.
+    `sleep_s` is a per-worker pause after each request (politeness); with
+    concurrency 1 it is a delay between consecutive requests.
+    """
+    fetcher = HttpAsyncFetcher(timeout_s=20.0, follow_redirects=True)
+    sem = asyncio.Semaphore(concurrency)
+    total = len(urls)
+
+    async def _one(idx: int, url: NormalizedUrl) -> None:
+        async with sem:
+            log.info("(%d/%d) Processing %s", idx, total, url)
+            record = await _scrape_one_url_async(fetcher, url, min_chars=min_chars, executor=executor)
+            await queue.put(record)
+
+            if sleep_s > 0:
+                await asyncio.sleep(sleep_s)
+
+    try:
+        await asyncio.gather(*(_one(idx, url) for idx, url in enumerate(urls, start=1)))
+    finally:
+        await fetcher.aclose()
+    # Only on success: if the writer failed, nothing drains the queue any more
+    await queue.put(None)
+
+
+async def _write_records(queue: "asyncio.Queue[Optional[ArticleRaw]]", writer: JsonlAppender) -> Tuple[int, int]:
+    """
+    Drain scraped records from the queue into the JSONL writer.
+    Returns (ok, failed).
+    """
+    ok = 0
+    failed = 0
+
+    while (record := await queue.get()) is not None:
+        writer.write(record.model_dump(mode="json"))
+        if record.status == "ok":
+            ok += 1
+        else:
+            failed += 1
+
+    return ok, failed
+
+
+async def _scrape_concurrently(
+    urls: List[NormalizedUrl],
+    out_file: Path,
+    *,
+    min_chars: int,
+    concurrency: int,
+    sleep_s: float,
+    workers: Optional[int],
+) -> Tuple[int, int]:
+    queue: asyncio.Queue[Optional[ArticleRaw]] = asyncio.Queue(maxsize=concurrency * 2)
+
+    # trafilatura/BeautifulSoup parsing holds the GIL, so extraction gets its own processes
+    with ProcessPoolExecutor(max_workers=workers) as pool, JsonlAppender(out_file, flush_every=100) as writer:
+        _, (ok, failed) = await asyncio.gather(
+            fetch_many(
+                urls,
+                queue,
+                min_chars=min_chars,
+                concurrency=concurrency,
+                sleep_s=sleep_s,
+                executor=pool,
+            ),
+            _write_records(queue, writer),
+        )
+
+    return ok, failed
 
 
 def scrape_urls_to_jsonl(
@@ -132,13 +265,20 @@ def scrape_urls_to_jsonl(
     limit: Optional[int] = None,
     sleep_s: float = 0.0,
     min_chars: int = 500,
+    concurrency: Optional[int] = None,
+    workers: Optional[int] = None,
 ) -> dict:
     """
-    Batch scrape URLs from file into raw JSONL.
+    Batch scrape URLs from file into raw JSONL, up to `concurrency` URLs at a time
+    (default: 32, or 1 when `sleep_s` is set, so the delay stays between requests).
+    Extraction runs in a pool of `workers` processes (default: CPU count).
 
     Strict no-duplicates policy:
     - If URL already exists in out_file (normalized), it is skipped and NOT written again.
     """
+    if concurrency is None:
+        concurrency = 1 if sleep_s > 0 else 32
+
     urls = read_urls_from_file(urls_file)
     urls = [normalize_url(u) for u in urls]
 
@@ -146,38 +286,31 @@ def scrape_urls_to_jsonl(
         urls = urls[:limit]
 
     seen = load_seen_urls(out_file)
-    fetcher = HttpFetcher(timeout_s=20.0, follow_redirects=True)
 
-    ok = 0
-    failed = 0
     skipped_existing = 0
-
-    try:
-        total = len(urls)
-        for idx, url in enumerate(urls, start=1):
-            if url in seen:
-                skipped_existing += 1
-                log.info("(%d/%d) Skipping already-scraped URL: %s", idx, total, url)
-                continue
-
-            log.info("(%d/%d) Processing %s", idx, total, url)
-
-            record = _scrape_one_url(fetcher, url, min_chars=min_chars)
-            append_jsonl(out_file, record.model_dump(mode="json"))
-
-            # mark as seen regardless of success/failure to prevent duplicates
-            seen.add(url)
-
-            if record.status == "ok":
-                ok += 1
-            else:
-                failed += 1
-
-            if sleep_s > 0:
-                time.sleep(sleep_s)
-
-    finally:
-        fetcher.close()
+    todo: List[NormalizedUrl] = []
+
+    total = len(urls)
+    for idx, url in enumerate(urls, start=1):
+        if url in seen:
+            skipped_existing += 1
+            log.info("(%d/%d) Skipping already-scraped URL: %s", idx, total, url)
+            continue
+
+        # mark as seen regardless of success/failure to prevent duplicates
+        seen.add(url)
+        todo.append(url)
+
+    ok, failed = asyncio.run(
+        _scrape_concurrently(
+            todo,
+            out_file,
+            min_chars=min_chars,
+            concurrency=concurrency,
+            sleep_s=sleep_s,
+            workers=workers,
+        )
+    )
 
     summary = {
         "total_input": len(urls),
@@ -211,7 +344,8 @@ def scrape_single_url_to_jsonl(
     fetcher = HttpFetcher(timeout_s=20.0, follow_redirects=True)
     try:
         record = _scrape_one_url(fetcher, url_norm, min_chars=min_chars)
-        append_jsonl(out_file, record.model_dump(mode="json"))
+        with JsonlAppender(out_file) as writer:
+            writer.write(record.model_dump(mode="json"))
 
         ok = 1 if record.status == "ok" else 0
         failed = 1 - ok
@@ -1,46 +1,353 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import functools
+import hashlib
 import logging
-from typing import List, Dict, Any
+import re
+from collections import deque
+from typing import Deque, List, Dict, Any, Optional, Sequence, Tuple
 
-from news_scraper.embeddings_client import EmbeddingsClient
-from news_scraper.vectorstore_chroma import ChromaVectorStore
+import numpy as np
+
+from news_scraper.config import settings
+from news_scraper.embeddings_client import get_embeddings_client
+from news_scraper.quantize import get_int8_index
+from news_scraper.vectorstore_chroma import get_vector_store, l2_normalize, merge_query_results
 
 log = logging.getLogger("news_scraper.search")
 
+# Semantic cache: reuse hits of a past query whose embedding is at least this cosine-similar
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_SIZE = 512
+# SimHash cache: reuse hits of a past query whose 64-bit SimHash differs in fewer bits, without embedding
+SIMHASH_MAX_DISTANCE = 3
+SIMHASH_CACHE_SIZE = 512
+
+# Default Chroma `include` fields; leave out "documents" when the full text isn't needed
+DEFAULT_INCLUDE = ("distances", "documents", "metadatas")
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def simhash64(text: str) -> int:
+    """
+    64-bit SimHash over lowercased word 3-grams (single words for shorter texts).
+    Near-identical texts get hashes with a small Hamming distance.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) >= 3:
+        shingles = {" ".join(tokens[i : i + 3]) for i in range(len(tokens) - 2)}
+    else:
+        shingles = set(tokens)
+    if not shingles:
+        return 0
+
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest(), "little") for sh in shingles],
+        dtype=np.uint64,
+    )
+    bits = (hashes[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+    votes = 2 * bits.sum(axis=0, dtype=np.int64) - len(hashes)
+    return sum(1 << b for b in np.flatnonzero(votes > 0).tolist())
+
+
+class _SimHashCache:
+    """
+    Recent (simhash, top_k, include, hits) entries, newest first; checked before the
+    query is embedded. Cleared when the document count changes.
+    """
+
+    def __init__(self, maxsize: int = SIMHASH_CACHE_SIZE, max_distance: int = SIMHASH_MAX_DISTANCE) -> None:
+        self._max_distance = max_distance
+        self._doc_count: Optional[int] = None
+        self._entries: Deque[Tuple[int, int, Tuple[str, ...], List[Dict[str, Any]]]] = deque(maxlen=maxsize)
+
+    def lookup(
+        self, sh: int, top_k: int, include: Tuple[str, ...], doc_count: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        if doc_count != self._doc_count:
+            self._doc_count = doc_count
+            self._entries.clear()
+
+        for cached_sh, cached_top_k, cached_include, hits in self._entries:
+            if (
+                _answers(cached_top_k, cached_include, top_k, include)
+                and (cached_sh ^ sh).bit_count() < self._max_distance
+            ):
+                return _project(hits, top_k, include)
+        return None
+
+    def store(self, sh: int, top_k: int, include: Tuple[str, ...], hits: List[Dict[str, Any]]) -> None:
+        self._entries.appendleft((sh, top_k, include, hits))
+
+
+def _answers(cached_top_k: int, cached_include: Tuple[str, ...], top_k: int, include: Tuple[str, ...]) -> bool:
+    """
+    Cached hits for a larger top_k / more include fields can answer a smaller request.
+    """
+    return cached_top_k >= top_k and set(include) <= set(cached_include)
+
+
+# Chroma include field -> hit key
+_HIT_FIELDS = (("distances", "score"), ("documents", "document"), ("metadatas", "metadata"))
+
+
+def _project(hits: List[Dict[str, Any]], top_k: int, include: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Cut cached hits down to a narrower request: first top_k, fields not in `include` set to None.
+    """
+    dropped = dict.fromkeys(key for field, key in _HIT_FIELDS if field not in include)
+    if not dropped:
+        return hits[:top_k]
+    return [{**hit, **dropped} for hit in hits[:top_k]]
+
+
+class _QueryCache:
+    """
+    Small in-memory cache of past query embeddings (L2-normalized rows of a
+    preallocated matrix) and their hits, with LRU eviction.
+    Valid for one collection state only: cleared when the document count changes.
+    """
+
+    def __init__(self, maxsize: int = SEMANTIC_CACHE_SIZE, threshold: float = SEMANTIC_CACHE_THRESHOLD) -> None:
+        self._maxsize = maxsize
+        self._threshold = threshold
+        self._doc_count: Optional[int] = None
+        self._mat: Optional[np.ndarray] = None
+        self._entries: List[Optional[tuple]] = []  # (top_k, include, hits) per row
+        self._last_used = np.zeros(maxsize, dtype=np.int64)
+        self._tick = 0
+
+    def _reset(self, doc_count: int) -> None:
+        self._doc_count = doc_count
+        self._mat = None
+        self._entries = []
+        self._last_used[:] = 0
+
+    def lookup(
+        self, qn: np.ndarray, top_k: int, include: Tuple[str, ...], doc_count: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        if doc_count != self._doc_count:
+            self._reset(doc_count)
+        if self._mat is None or not self._entries:
+            return None
+
+        sims = self._mat[: len(self._entries)] @ qn
+        for row in np.argsort(sims)[::-1]:
+            if sims[row] < self._threshold:
+                break
+            cached_top_k, cached_include, hits = self._entries[row]
+            if _answers(cached_top_k, cached_include, top_k, include):
+                self._tick += 1
+                self._last_used[row] = self._tick
+                return _project(hits, top_k, include)
+        return None
+
+    def store(self, qn: np.ndarray, top_k: int, include: Tuple[str, ...], hits: List[Dict[str, Any]]) -> None:
+        if self._mat is None:
+            self._mat = np.zeros((self._maxsize, qn.shape[0]), dtype=np.float32)
+
+        if len(self._entries) < self._maxsize:
+            row = len(self._entries)
+            self._entries.append(None)
+        else:
+            row = int(np.argmin(self._last_used))
+
+        self._mat[row] = qn
+        self._entries[row] = (top_k, include, hits)
+        self._tick += 1
+        self._last_used[row] = self._tick
+
+
+_semantic_cache = _QueryCache()
+_simhash_cache = _SimHashCache()
+
+
+def _query_results(
+    query_vecs: List[List[float]], top_k: int, include: Sequence[str] = DEFAULT_INCLUDE
+) -> Dict[str, Any]:
+    """
+    Run one Chroma query for all vectors; returns the raw Chroma result
+    (ids + the `include` fields, one inner list per vector).
+    """
+    store = get_vector_store()
+    qn = l2_normalize(query_vecs)
+
+    if settings.search_int8:
+        index = get_int8_index()
+        per_query = [index.query(q, top_k, include=include) for q in qn]
+        return {key: [r[key][0] for r in per_query] for key in per_query[0]}
+
+    return store.query(query_embeddings=qn, n_results=top_k, include=include)
+
+
+def _query_store_many(
+    query_vecs: List[List[float]], top_k: int, include: Sequence[str] = DEFAULT_INCLUDE
+) -> List[List[Dict[str, Any]]]:
+    """
+    Run one Chroma query for all vectors; returns one hit list per vector.
+    """
+    return _results_to_hits(_query_results(query_vecs, top_k, include), include)
+
+
+def _results_to_hits(
+    results: Dict[str, Any], include: Sequence[str] = DEFAULT_INCLUDE
+) -> List[List[Dict[str, Any]]]:
+    """
+    Convert a Chroma query result into one ranked hit list per query vector.
+    Fields not in `include` are None in the hits (even if the result has them,
+    e.g. distances of a sharded query).
+    """
+    missing = [[None] * len(ids) for ids in results["ids"]]
+    return [
+        [
+            {"rank": rank, "score": score, "document": doc, "metadata": meta}
+            for rank, (score, doc, meta) in enumerate(zip(dists, docs, metas), start=1)
+        ]
+        for dists, docs, metas in zip(
+            *((results.get(field) if field in include else None) or missing for field, _ in _HIT_FIELDS),
+        )
+    ]
+
+
+def _query_store(
+    query_vec: List[float], top_k: int, include: Sequence[str] = DEFAULT_INCLUDE
+) -> List[Dict[str, Any]]:
+    return _query_store_many([query_vec], top_k, include)[0]
+
+
+@functools.lru_cache(maxsize=1024)
+def _search_cached(query: str, top_k: int, include: Tuple[str, ...], doc_count: int) -> List[Dict[str, Any]]:
+    """
+    Exact-match tier: keyed on (query, top_k, include, collection size), so new
+    documents invalidate it. Misses fall through to the SimHash cache
+    (no embedding call), the semantic cache, then to Chroma.
+    """
+    sh = simhash64(query)
+    hits = _simhash_cache.lookup(sh, top_k, include, doc_count)
+    if hits is not None:
+        log.debug("SimHash cache hit for query %r", query)
+        return hits
+
+    query_vec = get_embeddings_client().embed_text(query)
+
+    qn = l2_normalize(query_vec)
+
+    hits = _semantic_cache.lookup(qn, top_k, include, doc_count)
+    if hits is None:
+        hits = _query_store(query_vec, top_k, include)
+        _semantic_cache.store(qn, top_k, include, hits)
+    else:
+        log.debug("Semantic cache hit for query %r", query)
+
+    _simhash_cache.store(sh, top_k, include, hits)
+    return hits
+
 
 def semantic_search(
     query: str,
     top_k: int = 5,
+    include: Sequence[str] = DEFAULT_INCLUDE,
 ) -> List[Dict[str, Any]]:
     """
     Perform semantic search over indexed articles.
     Returns top-k results with metadata and distance score.
+
+    Repeated and near-duplicate queries are answered from an in-process cache
+    (exact match, then query SimHash, then query-embedding cosine similarity
+    >= SEMANTIC_CACHE_THRESHOLD).
+
+    `include` selects the Chroma fields to fetch; e.g. ("distances", "metadatas")
+    skips reading full document texts (hit["document"] is then None).
     """
     if not query or not query.strip():
         raise ValueError("Query must not be empty")
 
-    store = ChromaVectorStore()
-    embedder = EmbeddingsClient()
+    doc_count = get_vector_store().count()
+    # cached hit dicts are shared between calls: hand out copies callers may modify
+    hits = copy.deepcopy(_search_cached(query.strip(), top_k, tuple(sorted(set(include))), doc_count))
+
+    log.info("Search returned %d results", len(hits))
+    return hits
 
-    query_vec = embedder.embed_text(query)
 
-    results = store._collection.query(
-        query_embeddings=[query_vec],
-        n_results=top_k,
-        include=["metadatas", "documents", "distances"],
-    )
+def semantic_search_many(
+    queries: List[str],
+    top_k: int = 5,
+) -> List[List[Dict[str, Any]]]:
+    """
+    Semantic search for several queries at once: one embeddings request
+    and one Chroma query for the whole batch.
+    Returns one top-k hit list per query, in input order.
+    """
+    if any(not q or not q.strip() for q in queries):
+        raise ValueError("Query must not be empty")
+    if not queries:
+        return []
+
+    query_vecs = get_embeddings_client().embed_texts([q.strip() for q in queries])
+    all_hits = _query_store_many(query_vecs, top_k)
+
+    log.info("Search returned results for %d queries", len(all_hits))
+    return all_hits
+
+
+def semantic_search_arrays(
+    query: str,
+    top_k: int = 5,
+) -> Dict[str, Any]:
+    """
+    Semantic search returning columns instead of hit dicts:
+    {"scores": float32[k], "ids": [...], "documents": [...], "metadatas": [...]},
+    ranked best first. Lets callers filter/rerank on `scores` with numpy.
+    Does not use the in-process cache.
+    """
+    if not query or not query.strip():
+        raise ValueError("Query must not be empty")
+
+    query_vec = get_embeddings_client().embed_text(query.strip())
+    results = _query_results([query_vec], top_k)
+
+    return {
+        "scores": np.asarray(results["distances"][0], dtype=np.float32),
+        "ids": results["ids"][0],
+        "documents": results["documents"][0],
+        "metadatas": results["metadatas"][0],
+    }
+
+
+async def semantic_search_async(
+    query: str,
+    top_k: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    Async variant of semantic_search for concurrent callers.
+    Awaits the embedding request and, when CHROMA_HOST is set, queries the
+    Chroma server through its async HTTP client; otherwise the local store
+    is queried in a worker thread. Does not use the in-process cache.
+    """
+    if not query or not query.strip():
+        raise ValueError("Query must not be empty")
 
-    hits: List[Dict[str, Any]] = []
+    query_vec = (await get_embeddings_client().embed_texts_async([query.strip()]))[0]
 
-    for i in range(len(results["ids"][0])):
-        hit = {
-            "rank": i + 1,
-            "score": results["distances"][0][i],
-            "document": results["documents"][0][i],
-            "metadata": results["metadatas"][0][i],
-        }
-        hits.append(hit)
+    if not settings.chroma_host:
+        hits = await asyncio.to_thread(_query_store, query_vec, top_k)
+    else:
+        shards = await get_vector_store().async_shards()
+        partials = await asyncio.gather(
+            *(
+                shard.query(
+                    query_embeddings=l2_normalize([query_vec]),
+                    n_results=top_k,
+                    include=["metadatas", "documents", "distances"],
+                )
+                for shard in shards
+            )
+        )
+        hits = _results_to_hits(merge_query_results(partials, top_k))[0]
 
     log.info("Search returned %d results", len(hits))
     return hits
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import functools
+import heapq
 import logging
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import chromadb
+import numpy as np
 from chromadb.api.models.Collection import Collection
 
 from news_scraper.config import settings
+from news_scraper.embeddings_client import EmbeddingsClient, get_embeddings_client
 from news_scraper.models import VectorDocument
 from news_scraper.models import ArticleAI
 
@@ -18,18 +28,22 @@ def _build_embedding_text(article: ArticleAI) -> str:
     """
     Build the text that will be embedded for semantic search.
     """
-    parts = []
+    t = article.title.strip() if article.title else ""
+    s = article.summary.strip() if article.summary else ""
+    tp = "Topics: " + ", ".join(article.topics) if article.topics else ""
 
-    if article.title:
-        parts.append(article.title.strip())
+    return "\n\n".join(p for p in (t, s, tp) if p)
 
-    if article.summary:
-        parts.append(article.summary.strip())
 
-    if article.topics:
-        parts.append("Topics: " + ", ".join(article.topics))
-
-    return "\n\n".join(parts)
+def l2_normalize(vectors: Any) -> np.ndarray:
+    """
+    L2-normalize embedding vector(s) (last axis) as float32.
+    Zero vectors are left as is.
+    """
+    arr = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(arr, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return arr / norms
 
 
 def _normalize_metadata(metadata: dict) -> dict:
@@ -44,40 +58,132 @@ def _normalize_metadata(metadata: dict) -> dict:
     return out
 
 
+def _trim(s: str, n: int) -> str:
+    """
+    First n characters of s; short strings (the common case) are returned as is.
+    """
+    return s if len(s) <= n else s[:n]
+
+
 def article_to_vector_doc(article: ArticleAI) -> VectorDocument:
     """
     Convert AI-enriched article to a vector-store document.
     Chroma metadata must be scalar values only (no lists/dicts).
     """
-    topics_str = ", ".join(article.topics) if article.topics else ""
+    topics = article.topics or ()
+    url = str(article.url)
 
     return VectorDocument(
-        id=str(article.url),
+        id=url,
         text=_build_embedding_text(article),
         metadata={
-            "url": str(article.url),
+            "url": url,
             "title": article.title or "",
-            "source": article.source or "",
-            "summary": (article.summary or "")[:2000],
+            # few distinct domains across many articles: share one str object per domain
+            "source": sys.intern(article.source) if article.source else "",
+            "summary": _trim(article.summary or "", 2000),
             # Store topics as a single string for Chroma compatibility
-            "topics": topics_str,
-            "topic_count": len(article.topics) if article.topics else 0,
+            "topics": ", ".join(topics),
+            "topic_count": len(topics),
         },
     )
 
 
+def articles_to_vector_docs(
+    articles: Iterable[ArticleAI],
+    embedder: Optional[EmbeddingsClient] = None,
+    batch: int = 64,
+) -> Tuple[List[VectorDocument], List[List[float]]]:
+    """
+    Convert articles to vector-store documents and embed them, `batch` texts
+    per embeddings call instead of one call per article.
+    Returns (docs, embeddings), ready for ChromaVectorStore.add_documents.
+    """
+    embedder = embedder or get_embeddings_client()
+    docs: List[VectorDocument] = []
+    vectors: List[List[float]] = []
+
+    it = iter(articles)
+    while chunk := list(islice(it, batch)):
+        chunk_docs = [article_to_vector_doc(a) for a in chunk]
+        vectors.extend(embedder.embed_texts([d.text for d in chunk_docs]))
+        docs.extend(chunk_docs)
+
+    return docs, vectors
+
+
+# Chroma query result fields that are merged across shards
+_RESULT_FIELDS = ("ids", "distances", "documents", "metadatas")
+
+
+def merge_query_results(partials: Sequence[Dict[str, Any]], n_results: int) -> Dict[str, Any]:
+    """
+    Merge per-shard Chroma query results (same query vectors, distances
+    included) into one result with the n_results nearest hits per query.
+    """
+    if len(partials) == 1:
+        return partials[0]
+
+    fields = [key for key in _RESULT_FIELDS if partials[0].get(key) is not None]
+    merged: Dict[str, Any] = {key: [] for key in fields}
+
+    for q in range(len(partials[0]["ids"])):
+        best = heapq.nsmallest(
+            n_results,
+            ((dist, shard, j) for shard, part in enumerate(partials) for j, dist in enumerate(part["distances"][q])),
+        )
+        for key in fields:
+            merged[key].append([partials[shard][key][q][j] for _, shard, j in best])
+
+    return merged
+
+
 class ChromaVectorStore:
     """
     Minimal persistent Chroma wrapper.
     We store embeddings explicitly (generated by our EmbeddingsClient).
+
+    With num_shards > 1 (CHROMA_SHARDS) documents are spread over collections
+    `<name>_0 .. <name>_{K-1}` by crc32 of their ID, so each HNSW graph stays
+    K times smaller; queries go to every shard and the hits are merged.
+    Changing the shard count needs a re-index.
     """
 
-    def __init__(self, persist_dir: Optional[Path] = None, collection_name: str = "news_articles") -> None:
+    def __init__(
+        self,
+        persist_dir: Optional[Path] = None,
+        collection_name: str = "news_articles",
+        num_shards: Optional[int] = None,
+    ) -> None:
         self.persist_dir = persist_dir or settings.chroma_dir
         self.persist_dir.mkdir(parents=True, exist_ok=True)
 
+        self.collection_name = collection_name
+        num_shards = num_shards or settings.chroma_shards
+        if num_shards == 1:
+            self.shard_names = [collection_name]
+        else:
+            self.shard_names = [f"{collection_name}_{i}" for i in range(num_shards)]
+
         self._client = chromadb.PersistentClient(path=str(self.persist_dir))
-        self._collection: Collection = self._client.get_or_create_collection(name=collection_name)
+        # Vectors are stored L2-normalized, so inner product == cosine similarity.
+        # The space only applies to newly created collections; existing ones keep theirs.
+        self._shards: List[Collection] = [
+            self._client.get_or_create_collection(name=name, metadata={"hnsw:space": "ip"})
+            for name in self.shard_names
+        ]
+
+        # worker threads for querying shards in parallel, created on first sharded query
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+        # (event loop, shard collections) from the async HTTP client, see async_shards()
+        self._async: Optional[Tuple[asyncio.AbstractEventLoop, List[Any]]] = None
+
+    def _shard_index(self, doc_id: str) -> int:
+        return zlib.crc32(doc_id.encode("utf-8")) % len(self._shards)
+
+    def count(self) -> int:
+        return sum(shard.count() for shard in self._shards)
 
     def existing_ids(self) -> Set[str]:
         """
@@ -87,19 +193,119 @@ class ChromaVectorStore:
         ids: Set[str] = set()
         # Chroma allows get(include=[]). We request ids.
         # Note: For very large collections, implement pagination.
-        got = self._collection.get(include=[])
-        for _id in got.get("ids", []):
-            ids.add(str(_id))
+        for shard in self._shards:
+            got = shard.get(include=[])
+            for _id in got.get("ids", []):
+                ids.add(str(_id))
         return ids
 
     def add_documents(self, docs: List[VectorDocument], embeddings: List[List[float]]) -> None:
         if len(docs) != len(embeddings):
             raise ValueError("docs and embeddings length mismatch")
 
-        self._collection.add(
-            ids=[d.id for d in docs],
-            documents=[d.text for d in docs],
-            metadatas=[_normalize_metadata(d.metadata) for d in docs],
-            embeddings=embeddings,
-        )
+        vectors = l2_normalize(embeddings)
+        by_shard: Dict[int, List[int]] = {}
+        for i, d in enumerate(docs):
+            by_shard.setdefault(self._shard_index(d.id), []).append(i)
+
+        for shard, rows in by_shard.items():
+            self._shards[shard].add(
+                ids=[docs[i].id for i in rows],
+                documents=[docs[i].text for i in rows],
+                metadatas=[_normalize_metadata(docs[i].metadata) for i in rows],
+                embeddings=vectors[rows],
+            )
         log.info("Added %d documents to Chroma", len(docs))
+
+    def query(
+        self,
+        query_embeddings: Any,
+        n_results: int,
+        include: Sequence[str] = ("metadatas", "documents", "distances"),
+    ) -> Dict[str, Any]:
+        """
+        collection.query over all shards; returns one Chroma-shaped result.
+        Sharded queries always include distances (needed to merge).
+        """
+        include = list(include)
+        if len(self._shards) > 1 and "distances" not in include:
+            include.append("distances")
+
+        if len(self._shards) == 1:
+            return self._shards[0].query(query_embeddings=query_embeddings, n_results=n_results, include=include)
+
+        # shard queries run concurrently (Chroma's native query code releases the GIL)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=len(self._shards), thread_name_prefix="chroma-shard")
+        partials = list(
+            self._pool.map(
+                lambda shard: shard.query(query_embeddings=query_embeddings, n_results=n_results, include=include),
+                self._shards,
+            )
+        )
+        return merge_query_results(partials, n_results)
+
+    def get(self, ids: List[str], include: Sequence[str]) -> Dict[str, Any]:
+        """
+        collection.get by IDs, each ID looked up in its own shard only.
+        Result order is not guaranteed.
+        """
+        if len(self._shards) == 1:
+            return self._shards[0].get(ids=ids, include=list(include))
+
+        by_shard: Dict[int, List[str]] = {}
+        for doc_id in ids:
+            by_shard.setdefault(self._shard_index(doc_id), []).append(doc_id)
+
+        merged: Dict[str, Any] = {key: [] for key in ("ids", *include)}
+        for shard, shard_ids in by_shard.items():
+            got = self._shards[shard].get(ids=shard_ids, include=list(include))
+            for key in merged:
+                merged[key].extend(got[key])
+        return merged
+
+    async def async_shards(self) -> List[Any]:
+        """
+        The same shard collections through chromadb.AsyncHttpClient on the
+        configured Chroma server (CHROMA_HOST/CHROMA_PORT), cached per event loop.
+
+        `index` only writes to the local store, so the server must serve the same
+        data as CHROMA_DIR (e.g. `chroma run --path <CHROMA_DIR>`). Missing
+        collections raise instead of being created empty.
+        """
+        if not settings.chroma_host:
+            raise RuntimeError("CHROMA_HOST is not set; async Chroma access needs a Chroma server")
+
+        loop = asyncio.get_running_loop()
+        if self._async is None or self._async[0] is not loop:
+            client = await chromadb.AsyncHttpClient(host=settings.chroma_host, port=settings.chroma_port)
+            shards = [await client.get_collection(name=name) for name in self.shard_names]
+            self._async = (loop, shards)
+        return self._async[1]
+
+    def close(self) -> None:
+        """
+        Release the shard query threads and the Chroma client (sqlite/HNSW handles).
+        Older chromadb versions have no close().
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        close = getattr(self._client, "close", None)
+        if close is not None:
+            close()
+
+
+@functools.lru_cache(maxsize=1)
+def get_vector_store() -> ChromaVectorStore:
+    """
+    Process-wide ChromaVectorStore for the default persist dir and collection.
+    """
+    return ChromaVectorStore()
+
+
+@atexit.register
+def _close_vector_store() -> None:
+    if get_vector_store.cache_info().currsize:
+        get_vector_store().close()
+        get_vector_store.cache_clear()
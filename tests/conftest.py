@@ -0,0 +1,8 @@
+import os
+import sys
+from pathlib import Path
+
+# Settings are loaded at import time and require an API key; tests never call OpenAI
+os.environ.setdefault("OPENAI_API_KEY", "sk-test-not-used")
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from news_scraper import analyze
+from news_scraper.models import LLMArticleAnalysis
+
+
+class _FakeLLMClient:
+    """Async LLM client stand-in: articles whose text contains FAIL raise."""
+
+    _model = "fake-model"
+
+    def __init__(self, batch_items_delta: int = 0) -> None:
+        self.batch_items_delta = batch_items_delta
+        self.calls = 0
+
+    async def analyze_article_async(self, prompt, limiter=None):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if "FAIL" in prompt:
+            raise RuntimeError("llm failed")
+        return LLMArticleAnalysis(summary="A summary.", topics=["a", "b", "c"])
+
+    async def analyze_articles_batch_async(self, prompt, expected, limiter=None):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.batch_items_delta:
+            raise ValueError(f"LLM batch output has {expected + self.batch_items_delta} items, expected {expected}")
+        return [LLMArticleAnalysis(summary="A summary.", topics=["a", "b", "c"])] * expected
+
+
+def _write_raw(path, texts):
+    with path.open("w", encoding="utf-8") as f:
+        for i, text in enumerate(texts):
+            f.write(json.dumps({"url": f"https://example.com/{i}", "title": f"t{i}", "text": text}) + "\n")
+
+
+def _statuses(path):
+    return [json.loads(line)["status"] for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = _FakeLLMClient()
+    monkeypatch.setattr(analyze, "get_llm_client", lambda: fake)
+    return fake
+
+
+def test_limit_counts_attempted_articles(tmp_path, client):
+    raw, out = tmp_path / "raw.jsonl", tmp_path / "ai.jsonl"
+    _write_raw(raw, ["body", "FAIL body", "body", "body", "body", "body"])
+
+    summary = analyze.analyze_raw_to_ai_jsonl(raw, out, limit=3, concurrency=2, batch_size=1)
+    assert (summary["processed"], summary["failed"]) == (2, 1)
+    assert sorted(_statuses(out)) == ["failed", "ok", "ok"]
+
+    # Already written URLs (failed ones included) are skipped and don't count toward the limit
+    summary = analyze.analyze_raw_to_ai_jsonl(raw, out, limit=2, concurrency=2, batch_size=1)
+    assert (summary["processed"], summary["failed"], summary["skipped_already"]) == (2, 0, 3)
+    assert len(_statuses(out)) == 5
+
+
+def test_wrong_batch_item_count_falls_back_to_single_requests(tmp_path, monkeypatch):
+    fake = _FakeLLMClient(batch_items_delta=-1)
+    monkeypatch.setattr(analyze, "get_llm_client", lambda: fake)
+    raw, out = tmp_path / "raw.jsonl", tmp_path / "ai.jsonl"
+    _write_raw(raw, ["body"] * 4)
+
+    summary = analyze.analyze_raw_to_ai_jsonl(raw, out, concurrency=1, batch_size=4)
+    assert (summary["processed"], summary["failed"]) == (4, 0)
+    assert fake.calls == 1 + 4
+
+
+def _run_with_timeout(func, timeout=10.0):
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = func()
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "pipeline did not shut down"
+    return outcome
+
+
+def test_worker_error_shuts_pipeline_down(tmp_path, client, monkeypatch):
+    raw, out = tmp_path / "raw.jsonl", tmp_path / "ai.jsonl"
+    _write_raw(raw, ["body"] * 200)
+    real_chunk = analyze._analyze_chunk
+
+    async def failing_chunk(client, chunk, limiter=None):
+        if chunk[0].url.path == "/5":
+            raise RuntimeError("worker crashed")
+        return await real_chunk(client, chunk, limiter)
+
+    monkeypatch.setattr(analyze, "_analyze_chunk", failing_chunk)
+    outcome = _run_with_timeout(lambda: analyze.analyze_raw_to_ai_jsonl(raw, out, concurrency=2, batch_size=1))
+    assert isinstance(outcome.get("error"), RuntimeError)
+    assert str(outcome["error"]) == "worker crashed"
+
+
+def test_writer_error_shuts_pipeline_down(tmp_path, client, monkeypatch):
+    raw, out = tmp_path / "raw.jsonl", tmp_path / "ai.jsonl"
+    _write_raw(raw, ["body"] * 200)
+
+    def failing_write(self, obj):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(analyze.JsonlAppender, "write", failing_write)
+    outcome = _run_with_timeout(lambda: analyze.analyze_raw_to_ai_jsonl(raw, out, concurrency=2, batch_size=1))
+    assert isinstance(outcome.get("error"), OSError)
+
+
+def test_reader_error_shuts_pipeline_down(tmp_path, client):
+    raw, out = tmp_path / "raw.jsonl", tmp_path / "ai.jsonl"
+    _write_raw(raw, ["body"] * 100)
+    with raw.open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"url": "not a url", "text": "body"}) + "\n")
+
+    outcome = _run_with_timeout(lambda: analyze.analyze_raw_to_ai_jsonl(raw, out, concurrency=2, batch_size=1))
+    assert isinstance(outcome.get("error"), ValueError)
@@ -0,0 +1,38 @@
+import asyncio
+import json
+import threading
+
+from news_scraper import index
+
+
+class _FakeEmbedder:
+    async def embed_texts_async(self, texts, limiter=None):
+        await asyncio.sleep(0)
+        return [[1.0, 0.0] for _ in texts]
+
+
+def test_writer_error_shuts_pipeline_down(tmp_path, monkeypatch):
+    ai = tmp_path / "ai.jsonl"
+    with ai.open("w", encoding="utf-8") as f:
+        for i in range(2000):
+            obj = {"url": f"https://example.com/{i}", "summary": f"s{i}", "topics": ["a", "b", "c"], "status": "ok"}
+            f.write(json.dumps(obj) + "\n")
+
+    async def failing_writer(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(index, "_write_batches", failing_writer)
+    counts = {"added": 0, "skipped_existing": 0, "skipped_ineligible": 0, "failed": 0}
+    outcome = {}
+
+    def run():
+        try:
+            asyncio.run(index._index_pipeline(ai, None, _FakeEmbedder(), set(), None, 4, 1.0, 256, 2, counts))
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive(), "pipeline did not shut down"
+    assert isinstance(outcome.get("error"), OSError)
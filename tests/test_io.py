@@ -0,0 +1,126 @@
+import json
+import os
+import random
+from urllib.parse import urlsplit, urlunsplit
+
+from news_scraper.io import SeenIndex, load_seen_urls, normalize_url
+
+
+def _reference_normalize_url(url: str) -> str:
+    """normalize_url as it was before the str fast path (urlsplit/urlunsplit only)."""
+    url = url.strip()
+    parts = urlsplit(url)
+    parts = parts._replace(fragment="")
+    normalized = urlunsplit(parts)
+    if normalized.endswith("/") and parts.path not in ("", "/"):
+        normalized = normalized[:-1]
+    return normalized
+
+
+def _outcome(func, url):
+    try:
+        return func(url)
+    except ValueError:
+        return ValueError
+
+
+CASES = [
+    "https://example.com",
+    "https://example.com/",
+    "https://example.com/news/",
+    "https://example.com/news/article-1",
+    "https://example.com/news/article-1/#comments",
+    "https://example.com/#top",
+    "https://example.com/?",
+    "https://example.com?q=1/",
+    "https://example.com/a/?q=1/",
+    "https://example.com/a/?q=1#frag/",
+    "https://example.com/a?",
+    "https://example.com/a/?",
+    "https:///path/",
+    "https://example.com:8080/a/",
+    "https://user@example.com/a/",
+    "http://example.com/a//",
+    "  https://example.com/a/  \n",
+    "https://example.com/a\t/b/",
+    "https://exa\nmple.com/a/",
+    "HTTPS://Example.com/a/",
+    "ftp://example.com/a/",
+    "example.com/a/",
+    "/relative/path/",
+    "",
+    "#",
+    "https://example.com/a#b#c/",
+    "https://[::1]/a/",
+    "https://[::1/a/",
+    "https://]",
+    "https://[//",
+    "https://example.com/a/?q[]=1",
+    "https://exa\uff0fmple.com/a/",
+    "https://пример.рф/новости/",
+]
+
+
+def test_normalize_url_matches_reference_on_edge_cases():
+    for url in CASES:
+        assert _outcome(normalize_url, url) == _outcome(_reference_normalize_url, url), url
+
+
+def test_normalize_url_matches_reference_randomized():
+    rng = random.Random(1234)
+    pieces = ["http://", "https://", "HTTP://", "ftp://", "", "example.com", "a.b", ":80", "@",
+              "/", "//", "/x", "?", "?q=1", "&", "#", "#f", "/", " ", "\t", "\n", "%2F", ";p",
+              "[", "]", "[::1]", "[v1.x]", "é", "\uff0f", "\u2100"]
+    for _ in range(20_000):
+        url = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 8)))
+        normalize_url.cache_clear()
+        assert _outcome(normalize_url, url) == _outcome(_reference_normalize_url, url), repr(url)
+
+
+def _write_jsonl(path, urls):
+    with path.open("a", encoding="utf-8") as f:
+        for url in urls:
+            f.write(json.dumps({"url": url, "title": "t"}) + "\n")
+
+
+def _set_mtime(path, mtime):
+    os.utime(path, (mtime, mtime))
+
+
+def test_seen_index_rebuilds_when_jsonl_is_newer(tmp_path):
+    jsonl = tmp_path / "articles.jsonl"
+    _write_jsonl(jsonl, ["https://example.com/a/", "https://example.com/b#x"])
+    index = SeenIndex(jsonl)
+
+    assert load_seen_urls(jsonl) == {"https://example.com/a", "https://example.com/b"}
+    assert index.path.exists()
+
+    # JSONL appended to without updating the sidecar: the sidecar is stale
+    _write_jsonl(jsonl, ["https://example.com/c"])
+    _set_mtime(index.path, 1_000_000)
+    _set_mtime(jsonl, 2_000_000)
+    assert not index.is_fresh()
+
+    assert load_seen_urls(jsonl) == {"https://example.com/a", "https://example.com/b", "https://example.com/c"}
+    assert index.is_fresh()
+    assert set(index.path.read_text(encoding="utf-8").splitlines()) == load_seen_urls(jsonl)
+
+
+def test_seen_index_trusts_fresh_sidecar(tmp_path):
+    jsonl = tmp_path / "articles.jsonl"
+    _write_jsonl(jsonl, ["https://example.com/a"])
+    index = SeenIndex(jsonl)
+    index.rebuild()
+
+    # A sidecar at least as new as the JSONL is used as is, without rescanning
+    index.add(["https://example.com/only-in-sidecar"])
+    _set_mtime(jsonl, 1_000_000)
+    _set_mtime(index.path, 1_000_000)
+    assert index.is_fresh()
+    assert load_seen_urls(jsonl) == {"https://example.com/a", "https://example.com/only-in-sidecar"}
+
+
+def test_seen_index_missing_files(tmp_path):
+    jsonl = tmp_path / "articles.jsonl"
+    assert load_seen_urls(jsonl) == set()
+    assert not SeenIndex(jsonl).is_fresh()
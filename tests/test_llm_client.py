@@ -0,0 +1,74 @@
+import json
+
+import msgspec
+import pytest
+
+from news_scraper.llm_client import _batch_line_to_result, parse_llm_batch_output, parse_llm_output
+from news_scraper.models import LLMArticleAnalysis
+
+GOOD = {"summary": "  A summary.  ", "topics": ["Politics", "economy", "politics ", "", "trade"]}
+
+
+def _response_line(text, status_code=200):
+    body = {"output": [{"type": "message", "content": [{"type": "output_text", "text": text}]}]}
+    return {"custom_id": "a", "response": {"status_code": status_code, "body": body}}
+
+
+def test_parse_llm_output_cleans_values():
+    analysis = parse_llm_output(json.dumps(GOOD))
+    assert analysis == LLMArticleAnalysis(summary="A summary.", topics=["politics", "economy", "trade"])
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "not json",
+        json.dumps({"summary": "A summary."}),
+        json.dumps({"summary": 1, "topics": ["a", "b", "c"]}),
+        json.dumps({"summary": "A summary.", "topics": "a, b, c"}),
+    ],
+)
+def test_parse_llm_output_decode_errors_become_value_errors(raw):
+    with pytest.raises(ValueError, match="Invalid LLM output") as exc_info:
+        parse_llm_output(raw)
+    assert isinstance(exc_info.value.__cause__, msgspec.DecodeError)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        {"summary": "   ", "topics": ["a", "b", "c"]},
+        {"summary": "A summary.", "topics": ["a", "A", "a "]},
+        {"summary": "A summary.", "topics": [f"t{i}" for i in range(8)]},
+    ],
+)
+def test_parse_llm_output_post_init_validation(obj):
+    with pytest.raises(ValueError):
+        parse_llm_output(json.dumps(obj))
+
+
+def test_parse_llm_batch_output():
+    raw = json.dumps({"articles": [GOOD, GOOD]})
+    assert [a.topics for a in parse_llm_batch_output(raw, 2)] == [["politics", "economy", "trade"]] * 2
+
+    with pytest.raises(ValueError, match="has 2 items, expected 3"):
+        parse_llm_batch_output(raw, 3)
+    with pytest.raises(ValueError, match="Invalid LLM batch output"):
+        parse_llm_batch_output(json.dumps([GOOD, GOOD]), 2)
+
+
+def test_batch_line_to_result():
+    ok = _batch_line_to_result(_response_line(json.dumps(GOOD)))
+    assert isinstance(ok, LLMArticleAnalysis) and ok.summary == "A summary."
+
+    error = _batch_line_to_result({"custom_id": "a", "error": {"code": "server_error", "message": "boom"}})
+    assert isinstance(error, RuntimeError) and "server_error: boom" in str(error)
+
+    http_error = _batch_line_to_result(_response_line(json.dumps(GOOD), status_code=500))
+    assert isinstance(http_error, RuntimeError) and "HTTP 500" in str(http_error)
+
+    no_text = _batch_line_to_result({"custom_id": "a", "response": {"status_code": 200, "body": {"output": []}}})
+    assert isinstance(no_text, RuntimeError)
+
+    invalid = _batch_line_to_result(_response_line("not json"))
+    assert isinstance(invalid, ValueError)
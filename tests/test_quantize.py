@@ -0,0 +1,89 @@
+import numpy as np
+import orjson
+
+from news_scraper.models import VectorDocument
+from news_scraper.quantize import Int8ShadowIndex, quantize_int8
+from news_scraper.vectorstore_chroma import ChromaVectorStore, l2_normalize
+
+
+def _docs(vectors, offset=0):
+    return [VectorDocument(id=f"https://example.com/{offset + i}", text=f"text {i}", metadata={"n": i}) for i in range(len(vectors))]
+
+
+def _exact_top_k(vectors, query, k):
+    sims = l2_normalize(vectors) @ query
+    return [f"https://example.com/{i}" for i in np.argsort(-sims, kind="stable")[:k]]
+
+
+def test_quantize_int8_round_trip():
+    vectors = np.random.default_rng(0).normal(size=(5, 32)).astype(np.float32)
+    codes, scales = quantize_int8(vectors)
+    assert codes.dtype == np.int8 and np.abs(codes).max() == 127
+    np.testing.assert_allclose(codes * scales[:, None], vectors, atol=float(scales.max()))
+
+
+def test_query_matches_exact_search(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(500, 32)).astype(np.float32)
+    store = ChromaVectorStore(persist_dir=tmp_path, num_shards=3)
+    store.add_documents(_docs(vectors), vectors)
+    index = Int8ShadowIndex(store)
+    index.add([d.id for d in _docs(vectors)], vectors)
+
+    for query in l2_normalize(rng.normal(size=(20, 32))):
+        result = index.query(query, top_k=10)
+        assert result["ids"][0] == _exact_top_k(vectors, query, 10)
+        distances = result["distances"][0]
+        assert distances == sorted(distances)
+        assert result["metadatas"][0][0]["n"] == int(result["ids"][0][0].rsplit("/", 1)[1])
+        assert result["documents"][0][0].startswith("text ")
+    store.close()
+
+
+def test_rebuild_on_empty_store_then_add(tmp_path):
+    store = ChromaVectorStore(persist_dir=tmp_path)
+    index = Int8ShadowIndex(store)
+    assert index.rebuild() == 0
+    assert not index.meta_path.exists()
+
+    vectors = np.random.default_rng(2).normal(size=(50, 16)).astype(np.float32)
+    store.add_documents(_docs(vectors), vectors)
+    index.add([d.id for d in _docs(vectors)], vectors)
+    assert orjson.loads(index.meta_path.read_bytes()) == {"dim": 16}
+
+    query = l2_normalize(vectors[7])
+    assert index.query(query, top_k=3, include=("distances",))["ids"][0][0] == "https://example.com/7"
+    store.close()
+
+
+def test_rebuild_exports_store_and_incomplete_index_falls_back(tmp_path):
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(40, 16)).astype(np.float32)
+    store = ChromaVectorStore(persist_dir=tmp_path, num_shards=2)
+    store.add_documents(_docs(vectors), vectors)
+    index = Int8ShadowIndex(store)
+
+    # Indexed before the shadow index existed: Chroma answers directly
+    query = l2_normalize(vectors[3])
+    fallback = index.query(query, top_k=5, include=("distances", "metadatas"))
+    assert set(fallback) == {"ids", "distances", "metadatas"}
+    assert fallback["ids"] == store.query([query], n_results=5)["ids"]
+
+    assert index.rebuild() == 40
+    assert index.query(query, top_k=5)["ids"][0] == _exact_top_k(vectors, query, 5)
+    store.close()
+
+
+def test_store_get_across_shards(tmp_path):
+    vectors = np.random.default_rng(4).normal(size=(30, 8)).astype(np.float32)
+    store = ChromaVectorStore(persist_dir=tmp_path, num_shards=3)
+    store.add_documents(_docs(vectors), vectors)
+
+    wanted = [f"https://example.com/{i}" for i in (0, 5, 29, 12)]
+    got = store.get(wanted, include=["embeddings", "metadatas"])
+    assert sorted(got["ids"]) == sorted(wanted)
+    for doc_id, emb, meta in zip(got["ids"], got["embeddings"], got["metadatas"]):
+        i = int(doc_id.rsplit("/", 1)[1])
+        assert meta["n"] == i
+        np.testing.assert_allclose(emb, l2_normalize(vectors[i]), rtol=1e-5, atol=1e-6)
+    store.close()
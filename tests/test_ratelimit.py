@@ -0,0 +1,149 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from news_scraper.index import _embed_batches
+from news_scraper.models import VectorDocument
+from news_scraper.ratelimit import AdaptiveLimiter, create_with_limiter
+
+
+def _rate_limit_error() -> openai.RateLimitError:
+    response = httpx.Response(429, request=httpx.Request("POST", "https://api.openai.com/v1/embeddings"))
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+class _FakeResource:
+    """Async OpenAI resource stand-in: `with_raw_response.create` fails with 429 `fail` times."""
+
+    def __init__(self, fail: int = 0, headers=None) -> None:
+        self.fail = fail
+        self.headers = headers or {}
+        self.with_raw_response = self
+
+    async def create(self, **kwargs):
+        if self.fail:
+            self.fail -= 1
+            raise _rate_limit_error()
+        return SimpleNamespace(headers=self.headers, parse=lambda: kwargs)
+
+
+def test_limiter_halves_on_429_and_recovers():
+    limiter = AdaptiveLimiter(8)
+
+    async def run():
+        resource = _FakeResource(fail=2)
+        for _ in range(2):
+            with pytest.raises(openai.RateLimitError):
+                await create_with_limiter(resource, limiter, input="x")
+        assert limiter.limit == 2
+
+        for _ in range(10):
+            assert await create_with_limiter(resource, limiter, input="x") == {"input": "x"}
+        assert limiter.limit == 8
+
+    asyncio.run(run())
+
+
+def test_limiter_backs_off_on_low_remaining_headers():
+    limiter = AdaptiveLimiter(8, min_limit=2)
+    low = {"x-ratelimit-remaining-requests": "5", "x-ratelimit-limit-requests": "100"}
+    for expected in (4, 2, 2):
+        limiter.on_response(low)
+        assert limiter.limit == expected
+
+    limiter.on_response({"x-ratelimit-remaining-tokens": "90000", "x-ratelimit-limit-tokens": "100000"})
+    assert limiter.limit == 3
+
+
+def test_limiter_bounds_in_flight():
+    limiter = AdaptiveLimiter(3)
+    state = {"cur": 0, "max": 0}
+
+    async def task():
+        async with limiter:
+            state["cur"] += 1
+            state["max"] = max(state["max"], state["cur"])
+            await asyncio.sleep(0.001)
+            state["cur"] -= 1
+
+    async def run():
+        await asyncio.gather(*(task() for _ in range(20)))
+
+    asyncio.run(run())
+    assert state["max"] == 3
+
+
+def test_cancelled_waiter_passes_its_wakeup_on():
+    async def run():
+        limiter = AdaptiveLimiter(1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter:
+                await release.wait()
+
+        async def waiter():
+            async with limiter:
+                return "ok"
+
+        asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        woken = asyncio.create_task(waiter())
+        other = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.sleep(0)  # holder leaves and wakes `woken`, which is cancelled before it runs
+        woken.cancel()
+        return await asyncio.wait_for(other, 1)
+
+    assert asyncio.run(run()) == "ok"
+
+
+class _FakeEmbedder:
+    def __init__(self, fail_on: str) -> None:
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def embed_texts_async(self, texts, limiter=None):
+        async with limiter:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(0.001)
+                if self.fail_on in texts:
+                    raise RuntimeError("embedding failed")
+                return [[float(len(t))] for t in texts]
+            finally:
+                self.in_flight -= 1
+
+
+def test_embed_batches_runs_concurrently_through_limiter():
+    docs = [VectorDocument(id=f"id{i}", text=f"text {i}") for i in range(50)]
+    embedder = _FakeEmbedder(fail_on="text 7")
+    existing = {d.id for d in docs}
+    counts = {"failed": 0}
+
+    async def run():
+        doc_queue = asyncio.Queue()
+        write_queue = asyncio.Queue()
+        for d in docs:
+            doc_queue.put_nowait(d)
+        doc_queue.put_nowait(None)
+
+        await _embed_batches(embedder, existing, doc_queue, write_queue, counts, 5, 1.0, AdaptiveLimiter(3))
+
+        written = []
+        while (item := write_queue.get_nowait()) is not None:
+            written.extend(item[0])
+        return written
+
+    written = asyncio.run(run())
+    assert embedder.max_in_flight == 3
+    assert counts["failed"] == 5
+    assert len(written) == 45
+    assert "id7" not in existing and len(existing) == 45
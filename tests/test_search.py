@@ -0,0 +1,182 @@
+import numpy as np
+import pytest
+
+from news_scraper import search
+from news_scraper.search import _QueryCache, _SimHashCache, simhash64
+
+QUERY = "EU agrees new sanctions package against Russia over the war in Ukraine"
+INCLUDE = ("distances", "documents", "metadatas")
+
+
+def _hits(n, tag="x"):
+    return [
+        {"rank": i, "score": 0.1 * i, "document": f"{tag} doc {i}", "metadata": {"url": f"https://example.com/{tag}/{i}"}}
+        for i in range(1, n + 1)
+    ]
+
+
+def _unit(vec):
+    vec = np.asarray(vec, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def _with_cosine(base, cos):
+    """Unit vector at cosine `cos` from unit vector `base` (in its plane with the next axis)."""
+    other = np.roll(base, 1)
+    other = _unit(other - (other @ base) * base)
+    return _unit(cos * base + np.sqrt(1 - cos**2) * other)
+
+
+def test_simhash_cache_near_duplicate_hits_and_distant_misses():
+    cache = _SimHashCache()
+    sh = simhash64(QUERY)
+    assert cache.lookup(sh, 5, INCLUDE, doc_count=10) is None
+    cache.store(sh, 5, INCLUDE, _hits(5))
+
+    # case/punctuation-only variants hash identically
+    assert simhash64(QUERY.upper() + "!") == sh
+    assert cache.lookup(sh ^ 0b11, 5, INCLUDE, doc_count=10) == _hits(5)
+    assert cache.lookup(sh ^ 0b111, 5, INCLUDE, doc_count=10) is None
+    assert cache.lookup(simhash64("Black Sea grain deal collapses"), 5, INCLUDE, doc_count=10) is None
+
+    # a smaller request is answered from a larger cached one, trimmed
+    narrow = cache.lookup(sh, 2, ("metadatas",), doc_count=10)
+    assert [h["rank"] for h in narrow] == [1, 2]
+    assert narrow[0]["document"] is None and narrow[0]["score"] is None
+    assert cache.lookup(sh, 6, INCLUDE, doc_count=10) is None
+
+
+def test_simhash_cache_cleared_when_doc_count_changes():
+    cache = _SimHashCache()
+    sh = simhash64(QUERY)
+    cache.lookup(sh, 5, INCLUDE, doc_count=10)
+    cache.store(sh, 5, INCLUDE, _hits(5))
+
+    assert cache.lookup(sh, 5, INCLUDE, doc_count=11) is None
+    assert cache.lookup(sh, 5, INCLUDE, doc_count=10) is None
+
+
+def test_query_cache_threshold():
+    cache = _QueryCache(threshold=0.95)
+    base = _unit(np.random.default_rng(0).normal(size=16))
+    assert cache.lookup(base, 5, INCLUDE, doc_count=10) is None
+    cache.store(base, 5, INCLUDE, _hits(5))
+
+    assert cache.lookup(_with_cosine(base, 0.96), 5, INCLUDE, doc_count=10) == _hits(5)
+    assert cache.lookup(_with_cosine(base, 0.94), 5, INCLUDE, doc_count=10) is None
+
+
+def test_query_cache_cleared_when_doc_count_changes():
+    cache = _QueryCache()
+    base = _unit(np.random.default_rng(1).normal(size=16))
+    cache.lookup(base, 5, INCLUDE, doc_count=10)
+    cache.store(base, 5, INCLUDE, _hits(5))
+
+    assert cache.lookup(base, 5, INCLUDE, doc_count=11) is None
+    assert cache.lookup(base, 5, INCLUDE, doc_count=10) is None
+
+
+def test_query_cache_evicts_least_recently_used():
+    cache = _QueryCache(maxsize=2)
+    a, b, c = np.eye(3, dtype=np.float32)
+    cache.lookup(a, 1, INCLUDE, doc_count=1)
+    cache.store(a, 1, INCLUDE, _hits(1, "a"))
+    cache.store(b, 1, INCLUDE, _hits(1, "b"))
+    assert cache.lookup(a, 1, INCLUDE, doc_count=1) == _hits(1, "a")
+
+    cache.store(c, 1, INCLUDE, _hits(1, "c"))
+    assert cache.lookup(b, 1, INCLUDE, doc_count=1) is None
+    assert cache.lookup(a, 1, INCLUDE, doc_count=1) == _hits(1, "a")
+
+
+class _FakeStore:
+    def __init__(self) -> None:
+        self.doc_count = 10
+        self.queries = 0
+
+    def count(self) -> int:
+        return self.doc_count
+
+    def query(self, query_embeddings, n_results, include):
+        self.queries += 1
+        hits = _hits(n_results, tag=str(self.queries))
+        return {
+            "ids": [[h["metadata"]["url"] for h in hits]],
+            "distances": [[h["score"] for h in hits]],
+            "documents": [[h["document"] for h in hits]],
+            "metadatas": [[h["metadata"] for h in hits]],
+        }
+
+
+class _FakeEmbedder:
+    def __init__(self, vectors) -> None:
+        self.vectors = vectors
+        self.calls = 0
+
+    def embed_text(self, text):
+        self.calls += 1
+        return self.vectors[text].tolist()
+
+
+@pytest.fixture
+def fake_search(monkeypatch):
+    base = _unit(np.random.default_rng(2).normal(size=16))
+    store = _FakeStore()
+    embedder = _FakeEmbedder(
+        {
+            QUERY: base,
+            QUERY.upper() + "!": base,
+            "sanctions on Russia": _with_cosine(base, 0.97),
+            "Black Sea grain deal collapses": _with_cosine(base, 0.5),
+        }
+    )
+    monkeypatch.setattr(search.settings, "search_int8", False)
+    monkeypatch.setattr(search, "get_vector_store", lambda: store)
+    monkeypatch.setattr(search, "get_embeddings_client", lambda: embedder)
+    monkeypatch.setattr(search, "_semantic_cache", _QueryCache())
+    monkeypatch.setattr(search, "_simhash_cache", _SimHashCache())
+    search._search_cached.cache_clear()
+    yield store, embedder
+    search._search_cached.cache_clear()
+
+
+def test_search_cache_tiers(fake_search):
+    store, embedder = fake_search
+    first = search.semantic_search(QUERY)
+    assert (store.queries, embedder.calls) == (1, 1)
+
+    # exact repeat and SimHash near-duplicate: no embedding call, no store query
+    assert search.semantic_search(QUERY) == first
+    assert search.semantic_search(QUERY.upper() + "!") == first
+    assert (store.queries, embedder.calls) == (1, 1)
+
+    # semantic near-duplicate: embedded, but served from the cache
+    assert search.semantic_search("sanctions on Russia") == first
+    assert (store.queries, embedder.calls) == (1, 2)
+
+    # below the threshold: goes to the store
+    assert search.semantic_search("Black Sea grain deal collapses") != first
+    assert (store.queries, embedder.calls) == (2, 3)
+
+
+def test_search_cache_invalidated_by_new_documents(fake_search):
+    store, embedder = fake_search
+    first = search.semantic_search(QUERY)
+    store.doc_count += 1
+    second = search.semantic_search(QUERY)
+    assert store.queries == 2
+    assert second != first
+
+
+def test_search_returns_copies_callers_may_modify(fake_search):
+    store, _ = fake_search
+    first = search.semantic_search(QUERY)
+    expected = [dict(h, metadata=dict(h["metadata"])) for h in first]
+
+    first[0]["metadata"]["url"] = "changed"
+    first[0]["score"] = -1.0
+    first.pop()
+
+    assert search.semantic_search(QUERY) == expected
+    assert search.semantic_search(QUERY.upper() + "!") == expected
+    assert store.queries == 1
@@ -0,0 +1,62 @@
+import numpy as np
+
+from news_scraper.models import VectorDocument
+from news_scraper.vectorstore_chroma import ChromaVectorStore, merge_query_results
+
+
+def _partial(ids, distances):
+    return {
+        "ids": [ids],
+        "distances": [distances],
+        "documents": [[f"doc {i}" for i in ids]],
+        "metadatas": [[{"id": i} for i in ids]],
+    }
+
+
+def test_merge_query_results_keeps_nearest_across_shards():
+    merged = merge_query_results(
+        [
+            _partial(["a", "b", "c"], [0.1, 0.4, 0.9]),
+            _partial(["d", "e"], [0.2, 0.3]),
+            _partial([], []),
+        ],
+        n_results=3,
+    )
+    assert merged["ids"] == [["a", "d", "e"]]
+    assert merged["distances"] == [[0.1, 0.2, 0.3]]
+    assert merged["documents"] == [["doc a", "doc d", "doc e"]]
+    assert merged["metadatas"] == [[{"id": "a"}, {"id": "d"}, {"id": "e"}]]
+
+
+def test_merge_query_results_per_query_and_missing_fields():
+    partials = [
+        {"ids": [["a"], ["b"]], "distances": [[0.5], [0.1]], "documents": None},
+        {"ids": [["c"], ["d"]], "distances": [[0.2], [0.3]], "documents": None},
+    ]
+    merged = merge_query_results(partials, n_results=5)
+    assert merged == {"ids": [["c", "a"], ["b", "d"]], "distances": [[0.2, 0.5], [0.1, 0.3]]}
+
+
+def test_merge_query_results_single_shard_is_passthrough():
+    part = _partial(["a"], [0.1])
+    assert merge_query_results([part], n_results=1) is part
+
+
+def test_sharded_store_matches_single_collection(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(60, 8)).tolist()
+    docs = [VectorDocument(id=f"https://example.com/{i}", text=f"text {i}", metadata={"n": i}) for i in range(60)]
+    queries = rng.normal(size=(3, 8))
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    results = []
+    for shards in (1, 3):
+        store = ChromaVectorStore(persist_dir=tmp_path / f"s{shards}", num_shards=shards)
+        store.add_documents(docs, vectors)
+        assert store.count() == 60
+        results.append(store.query(queries, n_results=5))
+        store.close()
+
+    single, sharded = results
+    assert sharded["ids"] == single["ids"]
+    np.testing.assert_allclose(sharded["distances"], single["distances"], rtol=1e-4, atol=1e-5)